@@ -1,15 +1,31 @@
 """Expose les differentes variantes d'enveloppe convexe implantees."""
 
-from .monotone import enveloppe_monotone
+from .monotone import enveloppe_monotone, enveloppe_monotone_indices, enveloppes_monotone_groupees
 from .quickhull import enveloppe_quickhull
 from .graham import enveloppe_graham
 from .mergehull import merge_hull
 from .preparata_hong import preparata_hong
+from .chan import enveloppe_chan
+from .kirkpatrick_seidel import enveloppe_kirkpatrick_seidel
+from .filtre import filtre_akl_toussaint
+from .incremental import IncrementalHull
+from .fenetre import SlidingWindowHull
+from .localisation import HullIndex
+from .pointset import PointSet
 
 __all__ = [
     "enveloppe_monotone",
+    "enveloppe_monotone_indices",
+    "enveloppes_monotone_groupees",
     "enveloppe_quickhull",
     "enveloppe_graham",
     "merge_hull",
-    "preparata_hong"
+    "preparata_hong",
+    "enveloppe_chan",
+    "enveloppe_kirkpatrick_seidel",
+    "filtre_akl_toussaint",
+    "IncrementalHull",
+    "SlidingWindowHull",
+    "HullIndex",
+    "PointSet",
 ]
@@ -0,0 +1,192 @@
+"""Pied a coulisse tournant: diametre, largeur et rectangle englobant minimal en O(h)."""
+
+import math
+
+import numpy as np
+
+from utils import area_signed, cross
+
+
+def diametre(enveloppe):
+    """Plus grande distance entre deux sommets; renvoie (distance, (p, q))."""
+    V = _sommets(enveloppe)
+    if len(V) <= 2:
+        return _dist(V[0], V[-1]), (V[0], V[-1])
+
+    meilleur = (-1.0, None)
+    for i, j, _, _ in _balayage(V):
+        h = len(V)
+        # Les sommets de l'arete i et le sommet antipodal (et son suivant en cas
+        # d'aretes paralleles) forment toutes les paires candidates.
+        for p, q in ((V[i], V[j]), (V[(i + 1) % h], V[j]), (V[i], V[(j + 1) % h])):
+            d = _dist(p, q)
+            if d > meilleur[0]:
+                meilleur = (d, (p, q))
+    return meilleur
+
+
+def largeur(enveloppe):
+    """Plus petite distance entre deux droites d'appui paralleles; renvoie (largeur, (a, b, p))."""
+    V = _sommets(enveloppe)
+    if len(V) <= 2:
+        return 0.0, (V[0], V[-1], V[0])
+
+    meilleur = (math.inf, None)
+    for i, j, _, _ in _balayage(V):
+        a, b = V[i], V[(i + 1) % len(V)]
+        d = cross(a, b, V[j]) / _dist(a, b)
+        if d < meilleur[0]:
+            meilleur = (d, (a, b, V[j]))
+    return meilleur
+
+
+def rectangle_minimal(enveloppe, critere="aire"):
+    """
+    Rectangle englobant d'aire (ou de perimetre) minimal; renvoie (valeur, coins).
+
+    Le rectangle optimal a un cote porte par une arete de l'enveloppe: pour chaque
+    arete on lit la hauteur (sommet antipodal) et l'etendue (projections extremes).
+    Les coins sont donnes en sens anti-horaire.
+    """
+    if critere not in ("aire", "perimetre"):
+        raise ValueError("critere doit valoir 'aire' ou 'perimetre'")
+    V = _sommets(enveloppe)
+    if len(V) <= 2:
+        a, b = V[0], V[-1]
+        valeur = 0.0 if critere == "aire" else 2 * _dist(a, b)
+        return valeur, [a, b, b, a]
+
+    meilleur = (math.inf, None)
+    for i, j, r, l in _balayage(V):
+        a, b = V[i], V[(i + 1) % len(V)]
+        norme = _dist(a, b)
+        ux, uy = (b[0] - a[0]) / norme, (b[1] - a[1]) / norme
+        hauteur = cross(a, b, V[j]) / norme
+        s_min = (V[l][0] - a[0]) * ux + (V[l][1] - a[1]) * uy
+        s_max = (V[r][0] - a[0]) * ux + (V[r][1] - a[1]) * uy
+        etendue = s_max - s_min
+        valeur = etendue * hauteur if critere == "aire" else 2 * (etendue + hauteur)
+        if valeur < meilleur[0]:
+            coins = [
+                (a[0] + s_min * ux, a[1] + s_min * uy),
+                (a[0] + s_max * ux, a[1] + s_max * uy),
+                (a[0] + s_max * ux - hauteur * uy, a[1] + s_max * uy + hauteur * ux),
+                (a[0] + s_min * ux - hauteur * uy, a[1] + s_min * uy + hauteur * ux),
+            ]
+            meilleur = (valeur, coins)
+    return meilleur
+
+
+def mesures_lot(enveloppes):
+    """
+    Version vectorisee pour un lot d'enveloppes anti-horaires.
+
+    Renvoie un dict de tableaux (un element par enveloppe): "diametre", "largeur",
+    "aire" et "perimetre" (rectangles minimaux). Les sommets extremes de chaque
+    arete sont trouves par recherche dichotomique (np.searchsorted) sur les angles
+    des aretes, deroules par enveloppe: O(H log H) pour H sommets au total.
+    """
+    enveloppes = [_sommets(e) for e in enveloppes]
+    nb = len(enveloppes)
+    resultat = {cle: np.zeros(nb) for cle in ("diametre", "largeur", "aire", "perimetre")}
+
+    pleines = [k for k, V in enumerate(enveloppes) if len(V) >= 3]
+    for k, V in enumerate(enveloppes):
+        if len(V) <= 2:
+            resultat["diametre"][k] = _dist(V[0], V[-1])
+            resultat["perimetre"][k] = 2 * _dist(V[0], V[-1])
+    if not pleines:
+        return resultat
+
+    tailles = np.array([len(enveloppes[k]) for k in pleines])
+    debut = np.concatenate(([0], np.cumsum(tailles)[:-1]))
+    groupe = np.repeat(np.arange(len(pleines)), tailles)
+    coords = np.array([p for k in pleines for p in enveloppes[k]], dtype=np.float64)
+    X, Y = coords[:, 0], coords[:, 1]
+
+    local = np.arange(len(X)) - debut[groupe]
+    suivant = debut[groupe] + (local + 1) % tailles[groupe]
+    ex, ey = X[suivant] - X, Y[suivant] - Y
+    norme = np.hypot(ex, ey)
+
+    # Angles des aretes deroules dans [0, 2pi) a partir de la premiere arete de
+    # chaque enveloppe, puis decales par enveloppe pour un unique tableau trie.
+    phi = np.arctan2(ey, ex)
+    phi0 = phi[debut][groupe]
+    cles = groupe * 8.0 + np.mod(phi - phi0, 2 * np.pi)
+
+    def extreme(decalage, score):
+        """Sommet maximisant score parmi le sommet d'appui et ses deux voisins."""
+        cible = groupe * 8.0 + np.mod(phi + decalage - phi0, 2 * np.pi)
+        k = np.searchsorted(cles, cible)
+        k = np.where((k >= len(X)) | (groupe[np.minimum(k, len(X) - 1)] != groupe), debut[groupe], k)
+        meilleur = k
+        valeur = score(k)
+        for pas in (-1, 1):
+            voisin = debut[groupe] + (k - debut[groupe] + pas) % tailles[groupe]
+            v = score(voisin)
+            plus = v > valeur
+            meilleur = np.where(plus, voisin, meilleur)
+            valeur = np.where(plus, v, valeur)
+        return meilleur, valeur
+
+    # Hauteur: sommet le plus eloigne de la droite de l'arete (normale interieure).
+    j, hauteur = extreme(np.pi, lambda k: (ex * (Y[k] - Y) - ey * (X[k] - X)) / norme)
+    _, s_max = extreme(np.pi / 2, lambda k: (ex * (X[k] - X) + ey * (Y[k] - Y)) / norme)
+    _, moins_s_min = extreme(3 * np.pi / 2, lambda k: -(ex * (X[k] - X) + ey * (Y[k] - Y)) / norme)
+    etendue = s_max + moins_s_min
+
+    # Diametre: extremites de l'arete contre le sommet antipodal et ses voisins.
+    diam = np.zeros(len(X))
+    for pas in (-1, 0, 1):
+        jj = debut[groupe] + (j - debut[groupe] + pas) % tailles[groupe]
+        diam = np.maximum(diam, np.hypot(X[jj] - X, Y[jj] - Y))
+        diam = np.maximum(diam, np.hypot(X[jj] - X[suivant], Y[jj] - Y[suivant]))
+
+    resultat["diametre"][pleines] = np.maximum.reduceat(diam, debut)
+    resultat["largeur"][pleines] = np.minimum.reduceat(hauteur, debut)
+    resultat["aire"][pleines] = np.minimum.reduceat(etendue * hauteur, debut)
+    resultat["perimetre"][pleines] = np.minimum.reduceat(2 * (etendue + hauteur), debut)
+    return resultat
+
+
+def _balayage(V):
+    """
+    Genere pour chaque arete i: (i, antipodal, projection max, projection min).
+
+    Les trois pointeurs ne font que tourner dans le sens anti-horaire: O(h) au total.
+    """
+    h = len(V)
+
+    def proj(i, k):
+        a, b = V[i], V[(i + 1) % h]
+        return (b[0] - a[0]) * (V[k][0] - a[0]) + (b[1] - a[1]) * (V[k][1] - a[1])
+
+    def haut(i, k):
+        return cross(V[i], V[(i + 1) % h], V[k])
+
+    j = r = 1
+    l = None
+    for i in range(h):
+        while haut(i, (j + 1) % h) > haut(i, j):
+            j = (j + 1) % h
+        while proj(i, (r + 1) % h) > proj(i, r):
+            r = (r + 1) % h
+        if l is None:
+            l = j
+        while proj(i, (l + 1) % h) < proj(i, l):
+            l = (l + 1) % h
+        yield i, j, r, l
+
+
+def _sommets(enveloppe):
+    V = [(float(p[0]), float(p[1])) for p in enveloppe]
+    if not V:
+        raise ValueError("enveloppe vide")
+    if len(V) > 2 and area_signed(V) < 0:
+        V.reverse()
+    return V
+
+
+def _dist(p, q):
+    return math.hypot(q[0] - p[0], q[1] - p[1])
@@ -0,0 +1,149 @@
+"""Algorithme de Chan (1996): enveloppe en O(n log h), sensible a la sortie."""
+
+from functools import partial
+
+from algorithms.entiers import coordonnees, en_entiers
+from algorithms.filtre import appliquer_filtre
+from algorithms.monotone import enveloppe_monotone_indices
+from algorithms.predicats import orient
+
+# Premiere taille de groupe essayee: les petits m coutent un appel par groupe.
+_T_MIN = 3
+
+
+def enveloppe_chan(points, prefilter=False, echelle=None):
+    """
+    1/groupes de taille m enveloppes par Monotone Chain (variante vectorisee)
+    2/marche de Jarvis sur les groupes avec tangentes par dichotomie
+    3/echec apres m pas => m <- m^2 et on recommence.
+
+    Aucun tri global: les groupes sont des tranches contigues de l'entree.
+    Renvoie l'enveloppe en sens anti-horaire depuis le minimum lexicographique.
+    Des coordonnees entieres restent entieres dans les coques (tangentes exactes);
+    echelle active le mode entier (voir entiers.en_entiers).
+    """
+    if echelle is not None:
+        return en_entiers(partial(enveloppe_chan, prefilter=prefilter), points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    coords = coordonnees(points)
+    if len(coords) == 0:
+        return []
+
+    t = _T_MIN
+    while True:
+        m = min(2 ** (2 ** t), len(coords))
+        enveloppe = _essai(coords, m)
+        if enveloppe is not None:
+            return enveloppe
+        t += 1
+
+
+def _essai(coords, m):
+    """Marche de Jarvis limitee a m sommets; renvoie None si l'enveloppe en a plus."""
+    coques = []
+    for k in range(0, len(coords), m):
+        bloc = coords[k:k + m]
+        coques.append(list(map(tuple, bloc[enveloppe_monotone_indices(bloc)].tolist())))
+
+    # Le minimum lexicographique global est le premier sommet de la coque de son groupe.
+    depart = min(coque[0] for coque in coques)
+    groupe = next(g for g, coque in enumerate(coques) if coque[0] == depart)
+    indice = 0
+    enveloppe = [depart]
+    for _ in range(m):
+        p = coques[groupe][indice]
+        meilleur = None
+        for g, coque in enumerate(coques):
+            if g == groupe:
+                # Dans son propre groupe, le successeur est le sommet suivant.
+                i = (indice + 1) % len(coque)
+            else:
+                i = _tangente(coque, p)
+            q = coque[i]
+            if q == p:
+                continue
+            if meilleur is None or _avant(p, q, coques[meilleur[0]][meilleur[1]]):
+                meilleur = (g, i)
+
+        if meilleur is None:
+            return enveloppe
+        groupe, indice = meilleur
+        suivant = coques[groupe][indice]
+        if suivant == enveloppe[0]:
+            return enveloppe
+        enveloppe.append(suivant)
+    return None
+
+
+def _avant(p, q, r):
+    """Vrai si q est plus a droite que r vu depuis p (ou aligne et plus loin)."""
+    o = orient(p, r, q)
+    if o != 0:
+        return o < 0
+    return _au_dela(p, r, q)
+
+
+def _au_dela(p, r, q):
+    """
+    Vrai si q, aligne avec p et r, est plus loin que r sur la demi-droite p -> r.
+    Compare des coordonnees plutot que des distances arrondies: exact.
+    """
+    if r[0] != p[0]:
+        return q[0] > r[0] if r[0] > p[0] else q[0] < r[0]
+    return q[1] > r[1] if r[1] > p[1] else q[1] < r[1]
+
+
+def _tangente(coque, p):
+    """
+    Indice du sommet de coque (anti-horaire) tel que toute la coque soit a gauche
+    de p -> sommet, par recherche dichotomique (p exterieur a la coque).
+    """
+    n = len(coque)
+    if n <= 3:
+        return _tangente_lineaire(coque, p)
+
+    def maximal(c):
+        # Les deux voisins de coque[c] sont a gauche (ou dessus) de p -> coque[c].
+        return orient(p, coque[c], coque[(c + 1) % n]) > 0 and orient(p, coque[c], coque[c - 1]) >= 0
+
+    if maximal(0):
+        return _plus_loin(coque, p, 0)
+    a, b = 0, n
+    for _ in range(2 * n.bit_length() + 2):
+        c = (a + b) // 2
+        if maximal(c):
+            return _plus_loin(coque, p, c)
+        descend_c = orient(p, coque[c], coque[(c + 1) % n]) > 0
+        monte_a = orient(p, coque[a], coque[(a + 1) % n]) < 0
+        if monte_a:
+            if descend_c or orient(p, coque[a], coque[c]) > 0:
+                b = c
+            else:
+                a = c
+        elif descend_c and orient(p, coque[a], coque[c]) < 0:
+            b = c
+        else:
+            a = c
+        if b - a <= 1:
+            break
+    # Cas aligne ou intervalle epuise: on termine par un balayage (rare).
+    return _tangente_lineaire(coque, p)
+
+
+def _plus_loin(coque, p, i):
+    """Prefere un voisin aligne avec p -> coque[i] et plus eloigne (sommets alignes)."""
+    n = len(coque)
+    for j in ((i - 1) % n, (i + 1) % n):
+        if orient(p, coque[i], coque[j]) == 0 and _au_dela(p, coque[i], coque[j]):
+            return j
+    return i
+
+
+def _tangente_lineaire(coque, p):
+    meilleur = None
+    for i, q in enumerate(coque):
+        if q == p:
+            continue
+        if meilleur is None or _avant(p, q, coque[meilleur]):
+            meilleur = i
+    return 0 if meilleur is None else meilleur
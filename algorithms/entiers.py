@@ -0,0 +1,54 @@
+"""Mode entier: coordonnees ramenees sur une grille entiere d'echelle declaree."""
+
+import numpy as np
+
+# Au-dela de 2**62 en valeur absolue, les coordonnees quantifiees ne tiennent plus
+# (avec leurs differences) dans un int64: elles restent alors des int Python.
+_LIMITE_INT64 = 2 ** 62
+
+
+def quantifier(points, echelle):
+    """
+    Ramene les points sur la grille de pas 1/echelle: q = arrondi(p * echelle).
+
+    Les coordonnees sont lues en float64. Renvoie un tableau (n, 2) d'int64, ou
+    d'objets int Python si les valeurs sortent de la plage sure des int64.
+    """
+    if not echelle > 0:
+        raise ValueError("echelle doit etre strictement positive")
+    q = np.rint(np.asarray(points, dtype=np.float64).reshape(-1, 2) * echelle)
+    if not np.isfinite(q).all():
+        raise ValueError("coordonnees non finies")
+    if len(q) == 0 or np.abs(q).max() < _LIMITE_INT64:
+        return q.astype(np.int64)
+    return np.array([[int(x), int(y)] for x, y in q.tolist()], dtype=object).reshape(-1, 2)
+
+
+def restituer(sommets, echelle):
+    """Ramene des sommets de la grille entiere dans les unites d'origine (tuples)."""
+    return [(p[0] / echelle, p[1] / echelle) for p in sommets]
+
+
+def en_entiers(fonction, points, echelle):
+    """
+    Applique fonction aux points quantifies, donnes en listes d'int Python: les
+    predicats d'orientation y sont exacts sans aucune tolerance. Les sommets
+    renvoyes sont convertis dans les unites d'origine.
+    """
+    grille = quantifier(points, echelle)
+    return restituer(fonction(grille.tolist()), echelle)
+
+
+def coordonnees(points):
+    """
+    Tableau (n, 2) des points: entier (int64, ou objets int Python au-dela) si
+    toutes les coordonnees sont entieres, float64 sinon.
+    """
+    tableau = np.asarray(points)
+    if tableau.dtype.kind in "iu" or (tableau.dtype == object and _entiers(tableau)):
+        return tableau.reshape(-1, 2)
+    return tableau.astype(np.float64).reshape(-1, 2)
+
+
+def _entiers(tableau):
+    return all(isinstance(v, (int, np.integer)) for v in tableau.reshape(-1).tolist())
@@ -0,0 +1,90 @@
+"""Enveloppe convexe d'une fenetre glissante (insertions et expirations)."""
+
+import time
+
+from algorithms.incremental import IncrementalHull
+from algorithms.monotone import enveloppe_monotone
+
+
+class SlidingWindowHull:
+    """
+    Enveloppe des points recents, bornee par max_age (secondes) ou max_count.
+
+    File a deux piles: les ajouts vont dans une pile d'entree dont l'enveloppe est
+    maintenue par IncrementalHull; les retraits se font sur une pile de sortie ou
+    chaque element garde l'enveloppe de lui-meme et de tous les points plus recents
+    de cette pile. Quand la sortie est vide, l'entree y est basculee d'un bloc.
+    Chaque point est donc insere deux fois au plus: O(h) amorti par mise a jour,
+    contre O(W log W) pour un recalcul complet de la fenetre.
+    """
+
+    def __init__(self, max_age=None, max_count=None):
+        if (max_age is None) == (max_count is None):
+            raise ValueError("preciser exactement un parametre: max_age ou max_count")
+        self.max_age = max_age
+        self.max_count = max_count
+        self._entree = []  # (instant, point), du plus ancien au plus recent.
+        self._coque_entree = IncrementalHull()
+        self._sortie = []  # (instant, point, enveloppe suffixe), le plus ancien au sommet.
+        self._sommets = []
+        self._a_jour = True
+
+    def add(self, point, instant=None):
+        """Ajoute un point horodate (time.monotonic() par defaut) puis fait expirer la fenetre."""
+        if instant is None:
+            instant = time.monotonic()
+        p = (point[0], point[1])
+        self._entree.append((instant, p))
+        self._coque_entree.add(p)
+        self._a_jour = False
+        self.expire(instant)
+
+    def expire(self, maintenant=None):
+        """Retire les points trop anciens ou en surnombre; renvoie le nombre retire."""
+        retires = 0
+        if self.max_count is not None:
+            while len(self) > self.max_count:
+                self._retire()
+                retires += 1
+        else:
+            if maintenant is None:
+                maintenant = time.monotonic()
+            while len(self) and maintenant - self._plus_ancien() > self.max_age:
+                self._retire()
+                retires += 1
+        return retires
+
+    @property
+    def vertices(self):
+        """Sommets de l'enveloppe de la fenetre, en sens anti-horaire."""
+        if not self._a_jour:
+            sortie = self._sortie[-1][2] if self._sortie else []
+            entree = self._coque_entree.vertices
+            if not sortie or not entree:
+                self._sommets = sortie or entree
+            else:
+                # Deux enveloppes de quelques sommets: le recalcul est negligeable.
+                self._sommets = enveloppe_monotone(sortie + entree)
+            self._a_jour = True
+        return list(self._sommets)
+
+    def __len__(self):
+        return len(self._entree) + len(self._sortie)
+
+    def _plus_ancien(self):
+        return self._sortie[-1][0] if self._sortie else self._entree[0][0]
+
+    def _retire(self):
+        if not self._sortie:
+            self._bascule()
+        self._sortie.pop()
+        self._a_jour = False
+
+    def _bascule(self):
+        """Transfere l'entree dans la sortie en calculant les enveloppes suffixes."""
+        suffixe = IncrementalHull()
+        for instant, p in reversed(self._entree):
+            suffixe.add(p)
+            self._sortie.append((instant, p, suffixe.vertices))
+        self._entree = []
+        self._coque_entree = IncrementalHull()
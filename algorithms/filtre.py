@@ -0,0 +1,71 @@
+"""Pre-filtre d'Akl-Toussaint: elimine les points strictement interieurs."""
+
+import numpy as np
+
+from algorithms.pointset import PointSet
+from algorithms.predicats import surement_a_gauche
+
+
+def filtre_akl_toussaint(points, octogone=True):
+    """
+    Supprime les points strictement interieurs au polygone des points extremes.
+
+    Les extremes sont pris selon x et y (quadrilatere) et, si octogone=True,
+    selon x+y et x-y. Renvoie (points_restants, nb_supprimes); les points
+    conserves gardent leur type et leur ordre d'origine (un PointSet filtre
+    reste un PointSet et garde son ordre lexicographique deja calcule).
+    """
+    if len(points) < 4:
+        return points, 0
+
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    garde = masque_akl_toussaint(pts[:, 0], pts[:, 1], octogone)
+    supprimes = len(pts) - int(np.count_nonzero(garde))
+    if supprimes == 0:
+        return points, 0
+    if isinstance(points, np.ndarray):
+        return points[garde], supprimes
+    if isinstance(points, PointSet):
+        return points.sous_ensemble(garde), supprimes
+    return [points[i] for i in np.flatnonzero(garde)], supprimes
+
+
+def appliquer_filtre(points, prefilter):
+    """Point d'entree commun des algorithmes: filtre seulement si demande."""
+    if not prefilter:
+        return points
+    restants, _ = filtre_akl_toussaint(points)
+    return restants
+
+
+def masque_akl_toussaint(x, y, octogone=True):
+    """Masque booleen des points a conserver (sur ou hors du polygone des extremes)."""
+    if octogone:
+        s = x + y
+        d = x - y
+        # Extremes ordonnes en sens anti-horaire selon la direction d'appui.
+        extremes = [np.argmin(y), np.argmax(d), np.argmax(x), np.argmax(s),
+                    np.argmax(y), np.argmin(d), np.argmin(x), np.argmin(s)]
+    else:
+        extremes = [np.argmin(y), np.argmax(x), np.argmax(y), np.argmin(x)]
+    return ~_masque_interieur(x, y, extremes)
+
+
+def _masque_interieur(xs, ys, sommets):
+    """Masque des points strictement a l'interieur du polygone convexe (indices CCW)."""
+    poly = []
+    for k in sommets:
+        p = (xs[k], ys[k])
+        if not poly or p != poly[-1]:
+            poly.append(p)
+    if len(poly) > 1 and poly[0] == poly[-1]:
+        poly.pop()
+    if len(poly) < 3:
+        return np.zeros(len(xs), dtype=bool)
+
+    # Seuls les points certainement a gauche de chaque arete (borne d'erreur comprise)
+    # sont elimines: un point a peine hors d'une arete est toujours conserve.
+    dedans = np.ones(len(xs), dtype=bool)
+    for i in range(len(poly)):
+        dedans &= surement_a_gauche(poly[i], poly[(i + 1) % len(poly)], xs, ys)
+    return dedans
@@ -1,20 +1,122 @@
 """Implementation de Graham Scan pour l'enveloppe convexe plane."""
 
-import math as m
-from utils import cross
+from functools import cmp_to_key, partial
 
+import numpy as np
 
-def enveloppe_graham(points):
-    """1/trouver pivot 2/trier par angle 3/empiler en supprimant les retours."""
-    P = sorted(points, key=lambda p: (p[1], p[0]))
-    pivot = P[0]
-    # Trie les points restants par angle polaire autour du pivot choisi.
-    sorted_pts = sorted(P[1:], key=lambda p: m.atan2(p[1] - pivot[1], p[0] - pivot[0]))
+from algorithms.entiers import coordonnees, en_entiers
+from algorithms.filtre import appliquer_filtre
+from algorithms.pointset import PointSet
+from algorithms.predicats import orient
 
-    enveloppe = [pivot, sorted_pts[0]]
-    for p in sorted_pts[1:]:
+# Au-dela de cette taille, les cles de tri sont calculees en bloc par numpy.
+_SEUIL_VECTORIEL = 256
+
+# Erreur absolue de la cle arrondie (|cle| <= 1): ~5u pour dx, dy, leur somme et la
+# division. Deux cles triees plus proches que _MARGE peuvent etre dans le mauvais ordre.
+_MARGE = 16 * 2.0 ** -53
+
+
+def enveloppe_graham(points, prefilter=False, echelle=None):
+    """
+    1/pivot par un simple minimum 2/tri par pseudo-angle 3/empiler en supprimant les retours.
+
+    echelle active le mode entier (voir entiers.en_entiers).
+    """
+    if echelle is not None:
+        return en_entiers(partial(enveloppe_graham, prefilter=prefilter), points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    if len(points) == 0:
+        return []
+    pivot, sorted_pts = ordre_angulaire(points)
+
+    enveloppe = [pivot]
+    for p in sorted_pts:
         # Tant que l'on forme un virage a droite, on depile le sommet courant.
-        while len(enveloppe) >= 2 and cross(enveloppe[-2], enveloppe[-1], p) <= 0:
+        while len(enveloppe) >= 2 and orient(enveloppe[-2], enveloppe[-1], p) <= 0:
             enveloppe.pop()
         enveloppe.append(p)
     return enveloppe
+
+
+def ordre_angulaire(points, seuil_vectoriel=_SEUIL_VECTORIEL):
+    """
+    Renvoie (pivot, autres): le minimum lexicographique, trouve en O(n), et les
+    autres points tries par angle polaire autour de lui.
+
+    Tous les points sont dans le demi-plan dx >= 0 du pivot: la cle est le
+    pseudo-angle dy / (dx + |dy|), croissant avec l'angle, sans trigonometrie.
+    A angle egal (points alignes avec le pivot), le plus proche passe d'abord,
+    ce qui rend l'ordre deterministe. Les copies du pivot sont ecartees. Les
+    points d'un tableau ou d'un PointSet sont rendus en tuples.
+    La cle arrondie n'est pas exactement monotone (dx, dy et la division sont
+    arrondis): les series de cles trop proches sont retriees exactement (_departage).
+    """
+    if isinstance(points, (np.ndarray, PointSet)):
+        points = list(map(tuple, coordonnees(points).tolist()))
+    if len(points) > seuil_vectoriel:
+        pivot, autres, cles = _ordre_vectoriel(points)
+        return pivot, _departage(pivot, autres, cles)
+
+    pivot = min(points, key=lambda p: (p[0], p[1]))
+    px, py = pivot[0], pivot[1]
+
+    def cle(p):
+        dx = p[0] - px
+        dy = p[1] - py
+        l1 = dx + abs(dy)
+        return dy / l1, l1
+
+    autres = [p for p in points if p[0] != px or p[1] != py]
+    cles = [cle(p) for p in autres]
+    rang = sorted(range(len(autres)), key=cles.__getitem__)
+    return pivot, _departage(pivot, [autres[i] for i in rang], np.array([cles[i][0] for i in rang]))
+
+
+def _ordre_vectoriel(points):
+    """Meme resultat que ordre_angulaire, cles calculees et triees par numpy."""
+    coords = coordonnees(points)
+    x = coords[:, 0]
+    y = coords[:, 1]
+    candidats = np.flatnonzero(x == x.min())
+    k = int(candidats[np.argmin(y[candidats])])
+
+    dx = x - x[k]
+    dy = y - y[k]
+    l1 = dx + np.abs(dy)
+    autres = np.flatnonzero(l1 > 0)
+    cles = dy[autres] / l1[autres]
+    rang = np.lexsort((l1[autres], cles))
+    ordre = autres[rang]
+    return points[k], [points[i] for i in ordre.tolist()], cles[rang]
+
+
+def _departage(pivot, autres, cles):
+    """
+    Corrige exactement l'ordre issu des cles arrondies (cles: les cles triees de
+    autres). Deux points dont les cles different de plus de _MARGE sont dans le
+    bon ordre; chaque serie de cles voisines a moins de _MARGE est retriee une
+    seule fois avec _compare, en O(k log k) pour une serie de k points.
+    """
+    if len(autres) < 2:
+        return autres
+    proches = np.flatnonzero(np.diff(cles) <= _MARGE)
+    if len(proches) == 0:
+        return autres
+    # La paire k couvre les rangs k et k + 1: des paires consecutives forment une serie.
+    coupures = np.flatnonzero(np.diff(proches) > 1)
+    debuts = proches[np.concatenate(([0], coupures + 1))]
+    fins = proches[np.concatenate((coupures, [len(proches) - 1]))] + 2
+    comparaison = cmp_to_key(partial(_compare, pivot))
+    for debut, fin in zip(debuts.tolist(), fins.tolist()):
+        autres[debut:fin] = sorted(autres[debut:fin], key=comparaison)
+    return autres
+
+
+def _compare(pivot, p, q):
+    # p avant q si q est a gauche de pivot->p; alignes: le plus proche (ordre
+    # lexicographique, exact sur un rayon issu du pivot) d'abord.
+    o = orient(pivot, p, q)
+    if o != 0:
+        return -1 if o > 0 else 1
+    return ((p[0], p[1]) > (q[0], q[1])) - ((p[0], p[1]) < (q[0], q[1]))
@@ -0,0 +1,89 @@
+"""Enveloppe convexe incrementale: insertion en ligne de points."""
+
+from bisect import bisect_left
+
+from algorithms.predicats import orient
+
+
+class IncrementalHull:
+    """
+    Maintient les chaines basse et haute (triees par (x, y)) d'un nuage croissant.
+
+    Chaque insertion localise le point par dichotomie en O(log h) puis retire les
+    sommets devenus concaves (amorti: chaque sommet n'est retire qu'une fois).
+    Un point interieur est rejete des la localisation, en O(log h). Le
+    remplacement dans la liste decale la fin de la chaine: une insertion retenue
+    coute O(h) au pire (un simple memmove, rapide en pratique). Les sommets exposes suivent
+    la convention de enveloppe_monotone: sens anti-horaire depuis le minimum
+    lexicographique, sans sommets alignes.
+    """
+
+    def __init__(self, points=()):
+        self._basse = []  # Chaine basse, gauche -> droite.
+        self._haute = []  # Chaine haute, gauche -> droite.
+        self._sommets = []
+        self._a_jour = True
+        self.add_many(points)
+
+    def add(self, point):
+        """Insere un point; renvoie False s'il ne modifie pas l'enveloppe."""
+        p = (point[0], point[1])
+        ajout_bas = _insere(self._basse, p, 1)
+        ajout_haut = _insere(self._haute, p, -1)
+        if ajout_bas or ajout_haut:
+            self._a_jour = False
+            return True
+        return False
+
+    def add_many(self, points):
+        """Insere une suite de points; renvoie le nombre de points retenus."""
+        return sum(self.add(p) for p in points)
+
+    @property
+    def vertices(self):
+        """Sommets courants en sens anti-horaire (liste recalculee seulement apres un ajout)."""
+        if not self._a_jour:
+            if len(self._basse) <= 1:
+                self._sommets = list(self._basse)
+            else:
+                self._sommets = self._basse[:-1] + self._haute[:0:-1]
+            self._a_jour = True
+        return list(self._sommets)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __contains__(self, point):
+        """Vrai si le point est dans l'enveloppe fermee (bord compris)."""
+        p = (point[0], point[1])
+        return _domine(self._basse, p, 1) and _domine(self._haute, p, -1)
+
+
+def _domine(chaine, p, signe):
+    """Vrai si p est du cote interieur (ou sur) de la chaine, dans sa plage en x."""
+    if not chaine or p < chaine[0] or p > chaine[-1]:
+        return False
+    k = bisect_left(chaine, p)
+    if chaine[k] == p:
+        return True
+    return signe * orient(chaine[k - 1], chaine[k], p) >= 0
+
+
+def _insere(chaine, p, signe):
+    """Insere p dans une chaine (signe=1 basse, -1 haute); renvoie True si p y entre."""
+    k = bisect_left(chaine, p)
+    if k < len(chaine) and chaine[k] == p:
+        return False
+    if 0 < k < len(chaine) and signe * orient(chaine[k - 1], chaine[k], p) >= 0:
+        # p est sur ou derriere l'arete qui l'encadre: la chaine est inchangee.
+        return False
+
+    # Retire les sommets qui ne tournent plus dans le bon sens de part et d'autre.
+    fin = k
+    while fin + 1 < len(chaine) and signe * orient(p, chaine[fin], chaine[fin + 1]) <= 0:
+        fin += 1
+    debut = k
+    while debut >= 2 and signe * orient(chaine[debut - 2], chaine[debut - 1], p) <= 0:
+        debut -= 1
+    chaine[debut:fin] = [p]
+    return True
@@ -0,0 +1,203 @@
+"""Algorithme de Kirkpatrick-Seidel ("marriage before conquest"), O(n log h)."""
+
+from functools import partial
+
+import numpy as np
+
+from algorithms.entiers import en_entiers
+from algorithms.filtre import appliquer_filtre
+from algorithms.predicats import croix_lot, orient, orient_lot
+
+# Marges (en unites d'arrondi u = 2**-53) des filtres flottants de _pont, au-dela
+# des bornes d'erreur: ~10u sur un ecart de hauteurs, ~6u sur un ecart de pentes.
+_MARGE = 32 * 2.0 ** -53
+_MARGE_PENTE = 8 * 2.0 ** -53
+
+# Sous cette taille, une chaine est calculee par un simple balayage monotone: le
+# cout fixe de numpy dans _pont depasse alors celui d'un tri.
+_SEUIL = 1024
+
+
+def enveloppe_kirkpatrick_seidel(points, prefilter=False, echelle=None, seuil=_SEUIL):
+    """
+    1/pont superieur au-dessus de la mediane des x (selection lineaire)
+    2/elagage des points sous le pont puis recursion a gauche et a droite
+    3/meme travail sur la chaine basse (points reflechis) 4/concatenation.
+
+    Aucun pre-tri: seules des selections lineaires (np.partition) sont faites.
+    Renvoie l'enveloppe en sens anti-horaire depuis le minimum lexicographique.
+    echelle active le mode entier (voir entiers.en_entiers). Pentes et hauteurs
+    sont comparees exactement (predicats.croix_lot), sans division. Les chaines
+    d'au plus seuil points sont calculees par balayage monotone (_chaine_monotone).
+    """
+    if echelle is not None:
+        return en_entiers(partial(enveloppe_kirkpatrick_seidel, prefilter=prefilter, seuil=seuil),
+                          points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(coords) == 0:
+        return []
+    x = coords[:, 0]
+    y = coords[:, 1]
+
+    haut = _demi_enveloppe(x, y, seuil)
+    # La chaine basse est la chaine haute du nuage reflechi (x, y) -> (-x, -y).
+    bas = [(-a, -b) for a, b in _demi_enveloppe(-x, -y, seuil)]
+
+    # bas va de droite a gauche, haut de gauche a droite: on les inverse pour
+    # parcourir la chaine basse puis la chaine haute en sens anti-horaire.
+    enveloppe = bas[::-1]
+    for p in reversed(haut):
+        if p != enveloppe[-1] and p != enveloppe[0]:
+            enveloppe.append(p)
+    return enveloppe
+
+
+def _demi_enveloppe(x, y, seuil):
+    """Chaine haute (gauche -> droite) du nuage, sans sommets alignes."""
+    gauche = _plus_haut(x, y, x.min())
+    droite = _plus_haut(x, y, x.max())
+    if gauche == droite:
+        return [gauche]
+    garde = _au_dessus(x, y, gauche, droite)
+    return _chaine_haute(gauche, droite, x[garde], y[garde], seuil)
+
+
+def _chaine_haute(gauche, droite, x, y, seuil):
+    """Sommets de gauche a droite (inclus) au-dessus du segment gauche -> droite."""
+    if len(x) == 0:
+        return [gauche, droite]
+    if len(x) + 2 <= seuil:
+        return _chaine_monotone(gauche, droite, x, y)
+
+    X = np.concatenate(([gauche[0]], x, [droite[0]]))
+    Y = np.concatenate(([gauche[1]], y, [droite[1]]))
+    k = (len(X) - 1) // 2
+    a = np.partition(X, k)[k]
+    pont_g, pont_d = _pont(X, Y, a)
+
+    if pont_g == gauche:
+        chaine = [gauche]
+    else:
+        garde = (x < pont_g[0]) & _au_dessus(x, y, gauche, pont_g)
+        chaine = _chaine_haute(gauche, pont_g, x[garde], y[garde], seuil)
+    if pont_d == droite:
+        return chaine + [droite]
+    garde = (x > pont_d[0]) & _au_dessus(x, y, pont_d, droite)
+    return chaine + _chaine_haute(pont_d, droite, x[garde], y[garde], seuil)
+
+
+def _chaine_monotone(gauche, droite, x, y):
+    """
+    Meme resultat que _chaine_haute, par la chaine haute de Monotone Chain: les
+    points (strictement au-dessus de gauche -> droite) sont tries par (x, y) et
+    seuls les virages a droite exacts (predicats.orient) sont gardes.
+    """
+    chaine = [gauche]
+    for p in sorted(zip(x.tolist(), y.tolist())) + [droite]:
+        while len(chaine) >= 2 and orient(chaine[-2], chaine[-1], p) >= 0:
+            chaine.pop()
+        chaine.append(p)
+    return chaine
+
+
+def _pont(X, Y, a):
+    """Arete de la chaine haute qui enjambe la verticale x = a (elagage par paires)."""
+    while len(X) > 2:
+        moitie = len(X) // 2
+        i = np.arange(moitie)
+        j = i + moitie
+        # Chaque paire est ordonnee par x croissant.
+        inverse = X[i] > X[j]
+        i[inverse], j[inverse] = j[inverse], i[inverse]
+
+        verticale = X[i] == X[j]
+        gardes = [np.where(Y[i] >= Y[j], i, j)[verticale]]
+        if len(X) % 2:
+            gardes.append([len(X) - 1])
+        i = i[~verticale]
+        j = j[~verticale]
+        if len(i) == 0:
+            X, Y = _selection(X, Y, gardes)
+            continue
+
+        # Pente mediane K (choisie sur les pentes flottantes): celle de la paire
+        # (p, q). Les comparaisons a K sont ensuite exactes, par produit vectoriel
+        # avec la direction q - p (predicats.croix_lot) plutot que par des pentes
+        # arrondies; les flottants ne servent qu'a ecarter les cas certains.
+        pentes = (Y[j] - Y[i]) / (X[j] - X[i])
+        k = (len(pentes) - 1) // 2
+        m = np.argpartition(pentes, k)[k]
+        K = pentes[m]
+        P = np.column_stack((X, Y))
+        p, q = P[i[m]], P[j[m]]
+
+        # Points d'appui de la droite de pente K (hauteur maximale le long de
+        # q - p). L'ecart de hauteur flottant entre deux points est faux d'au plus
+        # ~10u * max(|Y| + |K X|): seuls les points a moins de _MARGE de ce
+        # maximum sont departages exactement.
+        hauteur = Y - K * X
+        candidats = np.flatnonzero(~(hauteur < hauteur.max() - _MARGE * (np.abs(Y) + np.abs(K * X)).max()))
+        if len(candidats) == 1:
+            appui = candidats
+        else:
+            sommet = candidats[np.argmax(hauteur[candidats])]
+            while True:
+                ecart = croix_lot(p, q, P[sommet], P[candidats])  # Signe de hauteur - hauteur du sommet.
+                plus_haut = candidats[ecart > 0]
+                if len(plus_haut) == 0:
+                    break
+                sommet = plus_haut[np.argmax(hauteur[plus_haut])]
+            appui = candidats[ecart == 0]
+        xk = X[appui].min()
+        xm = X[appui].max()
+        if xk <= a < xm:
+            return _extremite(X, Y, appui, xk), _extremite(X, Y, appui, xm)
+
+        # Signe de pente(i, j) - K pour chaque paire (X[i] < X[j]): chaque pente
+        # flottante est a moins de 3u d'erreur relative, les paires plus proches
+        # de K que cette marge sont comparees exactement.
+        ordre = np.sign(pentes - K).astype(np.int8)
+        proches = np.flatnonzero(~(np.abs(pentes - K) > _MARGE_PENTE * (np.abs(pentes) + abs(K))))
+        proches = proches[proches != m]
+        ordre[m] = 0
+        if len(proches):
+            ordre[proches] = croix_lot(p, q, P[i[proches]], P[j[proches]])
+        if xm <= a:
+            # Le pont est plus a droite: sa pente est < K, le point gauche des
+            # paires de pente >= K ne peut pas en etre une extremite.
+            raide = ordre >= 0
+            gardes += [j[raide], i[~raide], j[~raide]]
+        else:
+            # Le pont est plus a gauche: sa pente est > K.
+            douce = ordre <= 0
+            gardes += [i[douce], i[~douce], j[~douce]]
+        X, Y = _selection(X, Y, gardes)
+
+    if X[0] > X[1]:
+        return (float(X[1]), float(Y[1])), (float(X[0]), float(Y[0]))
+    return (float(X[0]), float(Y[0])), (float(X[1]), float(Y[1]))
+
+
+def _selection(X, Y, gardes):
+    indices = np.concatenate([np.asarray(g, dtype=np.intp) for g in gardes])
+    return X[indices], Y[indices]
+
+
+def _extremite(X, Y, appui, xv):
+    """Point d'appui d'abscisse xv (le plus haut en cas de verticale)."""
+    candidats = appui[X[appui] == xv]
+    k = candidats[np.argmax(Y[candidats])]
+    return float(X[k]), float(Y[k])
+
+
+def _plus_haut(x, y, xv):
+    """Point d'abscisse xv ayant la plus grande ordonnee."""
+    sur_bord = np.flatnonzero(x == xv)
+    k = sur_bord[np.argmax(y[sur_bord])]
+    return float(x[k]), float(y[k])
+
+
+def _au_dessus(x, y, p, q):
+    """Masque des points strictement a gauche de p -> q (au-dessus si p.x < q.x)."""
+    return orient_lot(p, q, np.column_stack((x, y))) > 0
@@ -0,0 +1,115 @@
+"""Index de localisation de points dans une enveloppe convexe (requetes en O(log h))."""
+
+import numpy as np
+
+from utils import area_signed, cross
+
+INTERIEUR, BORD, EXTERIEUR = 1, 0, -1
+
+
+class HullIndex:
+    """
+    Index construit a partir d'une enveloppe en sens anti-horaire.
+
+    Le premier sommet sert de pivot: les diagonales qui en partent decoupent le
+    polygone en secteurs, et une dichotomie sur ces secteurs localise un point en
+    O(log h). tolerance borne |determinant| en dessous duquel un point est
+    considere sur le bord (meme convention que _EPS dans preparata_hong).
+    """
+
+    def __init__(self, enveloppe, tolerance=0.0):
+        sommets = [(float(p[0]), float(p[1])) for p in enveloppe]
+        if len(sommets) > 2 and area_signed(sommets) < 0:
+            sommets.reverse()
+        self.sommets = sommets
+        self.tolerance = tolerance
+        self._x = np.array([p[0] for p in sommets], dtype=np.float64)
+        self._y = np.array([p[1] for p in sommets], dtype=np.float64)
+
+    def locate(self, point):
+        """Renvoie INTERIEUR (1), BORD (0) ou EXTERIEUR (-1) pour un point."""
+        q = (float(point[0]), float(point[1]))
+        V = self.sommets
+        h = len(V)
+        tol = self.tolerance
+        if h <= 2:
+            return self._locate_degenere(q)
+
+        c1 = cross(V[0], V[1], q)
+        cn = cross(V[0], V[-1], q)
+        if c1 < -tol or cn > tol:
+            return EXTERIEUR
+
+        # Plus grand k tel que q soit a gauche (ou sur) de la diagonale V[0] -> V[k].
+        lo, hi = 1, h - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if cross(V[0], V[mid], q) >= 0:
+                lo = mid
+            else:
+                hi = mid
+
+        e = cross(V[lo], V[lo + 1], q)
+        if e < -tol:
+            return EXTERIEUR
+        if e <= tol or (lo == 1 and c1 <= tol) or (lo == h - 2 and cn >= -tol):
+            return BORD
+        return INTERIEUR
+
+    def locate_many(self, points):
+        """Version vectorisee de locate pour un tableau (m, 2); renvoie un tableau int8."""
+        q = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        qx = q[:, 0]
+        qy = q[:, 1]
+        h = len(self.sommets)
+        tol = self.tolerance
+        if h <= 2:
+            return np.array([self._locate_degenere(p) for p in q.tolist()], dtype=np.int8)
+
+        X, Y = self._x, self._y
+        c1 = _cross(X[0], Y[0], X[1], Y[1], qx, qy)
+        cn = _cross(X[0], Y[0], X[-1], Y[-1], qx, qy)
+
+        # Dichotomie menee en parallele sur toutes les requetes.
+        lo = np.ones(len(q), dtype=np.intp)
+        hi = np.full(len(q), h - 1, dtype=np.intp)
+        while True:
+            actif = hi - lo > 1
+            if not actif.any():
+                break
+            mid = (lo + hi) // 2
+            gauche = _cross(X[0], Y[0], X[mid], Y[mid], qx, qy) >= 0
+            lo = np.where(actif & gauche, mid, lo)
+            hi = np.where(actif & ~gauche, mid, hi)
+
+        e = _cross(X[lo], Y[lo], X[lo + 1], Y[lo + 1], qx, qy)
+        bord = (e <= tol) | ((lo == 1) & (c1 <= tol)) | ((lo == h - 2) & (cn >= -tol))
+        resultat = np.where(bord, BORD, INTERIEUR).astype(np.int8)
+        resultat[(c1 < -tol) | (cn > tol) | (e < -tol)] = EXTERIEUR
+        return resultat
+
+    def contains(self, points):
+        """Appartenance (bord compris) d'un point, ou d'un lot (m, 2) en un seul appel."""
+        if np.ndim(points) == 2:
+            return self.locate_many(points) >= 0
+        return self.locate(points) >= 0
+
+    def _locate_degenere(self, q):
+        """Enveloppe reduite a un point ou un segment: seul le bord peut contenir q."""
+        V = self.sommets
+        tol = self.tolerance
+        if not V:
+            return EXTERIEUR
+        a, b = V[0], V[-1]
+        if abs(cross(a, b, q)) > tol:
+            return EXTERIEUR
+        if len(V) == 1:
+            return BORD if abs(q[0] - a[0]) <= tol and abs(q[1] - a[1]) <= tol else EXTERIEUR
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        t = (q[0] - a[0]) * dx + (q[1] - a[1]) * dy
+        return BORD if -tol <= t <= dx * dx + dy * dy + tol else EXTERIEUR
+
+
+def _cross(ox, oy, ax, ay, bx, by):
+    """Produit vectoriel de utils.cross, evalue sur des tableaux."""
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
@@ -1,26 +1,71 @@
 """Implementation diviser-pour-regner de Merge Hull (Preparata et Shamos)."""
 
-from utils import area_signed
-from algorithms.monotone import enveloppe_monotone
+from functools import partial
 
+from algorithms.entiers import en_entiers
+from algorithms.filtre import appliquer_filtre
+from algorithms.pointset import PointSet
+from algorithms.predicats import orient
+from algorithms.parallele import enveloppe_parallele
 
-def merge_hull(points, seuil=64):
-    """1/tri 2/division rec 3/stop monotone 4/fusion par union de coques."""
-    pts = sorted({(p[0], p[1]) for p in points})
-    if len(pts) <= seuil:
-        # Cas de base: retour a l'algorithme monotone plus efficace sur petits ensembles.
-        return enveloppe_monotone(pts)
 
-    mid = len(pts) // 2
-    left = merge_hull(pts[:mid])
-    right = merge_hull(pts[mid:])
+def merge_hull(points, seuil=64, prefilter=False, workers=1, echelle=None):
+    """
+    0/pre-filtre optionnel 1/tri unique 2/division par plages 3/stop monotone 4/fusion lineaire.
+
+    workers > 1 repartit les niveaux hauts de la recursion sur un pool de processus.
+    echelle active le mode entier (voir entiers.en_entiers).
+    """
+    if echelle is not None:
+        return en_entiers(partial(merge_hull, seuil=seuil, prefilter=prefilter, workers=workers),
+                          points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    seuil = max(seuil, 1)
+    if workers > 1:
+        lower, upper = enveloppe_parallele(points, workers, partial(_divise, seuil=seuil), fusion)
+        return lower + upper[-2:0:-1]
+
+    if isinstance(points, PointSet):
+        pts = points.tuples_tries()
+    else:
+        pts = sorted({(p[0], p[1]) for p in points})
+    if not pts:
+        return []
+    # Le tri n'est fait qu'une fois: la recursion travaille sur des plages [lo, hi).
+    lower, upper = _divise(pts, 0, len(pts), seuil)
+    # Chaine basse gauche -> droite puis chaine haute droite -> gauche: sens anti-horaire.
+    return lower + upper[-2:0:-1]
+
+
+def _divise(pts, lo, hi, seuil):
+    """Renvoie les chaines (basse, haute), toutes deux gauche -> droite, de pts[lo:hi]."""
+    if hi - lo <= seuil:
+        # Cas de base: passe monotone directement sur la plage deja triee.
+        indices = range(lo, hi)
+        return _chaine((pts[k] for k in indices), 1), _chaine((pts[k] for k in indices), -1)
+
+    mid = (lo + hi) // 2
+    left = _divise(pts, lo, mid, seuil)
+    right = _divise(pts, mid, hi, seuil)
     return fusion(left, right)
 
 
 def fusion(left, right):
-    """Recalcule l'enveloppe monotone sur la reunion des sommets partiels."""
-    merged = {tuple(p) for p in left + right}
-    enveloppe = enveloppe_monotone(list(merged))
-    if len(enveloppe) > 2 and area_signed(enveloppe) < 0:
-        enveloppe.reverse()
-    return enveloppe
+    """
+    Fusionne deux coques separees (tous les points de left avant ceux de right).
+
+    Chaque coque est donnee par ses chaines (basse, haute) gauche -> droite.
+    La concatenation des chaines reste triee, une passe monotone suffit donc:
+    O(h_left + h_right) sans nouveau tri.
+    """
+    return _chaine(left[0] + right[0], 1), _chaine(left[1] + right[1], -1)
+
+
+def _chaine(sommets, signe):
+    """Passe de pile gauche -> droite: signe=1 chaine basse, signe=-1 chaine haute."""
+    pile = []
+    for p in sommets:
+        while len(pile) >= 2 and signe * orient(pile[-2], pile[-1], p) <= 0:
+            pile.pop()
+        pile.append(p)
+    return pile
@@ -1,18 +1,36 @@
 """Implementation de l'algorithme Monotone Chain (Andrew, 1979)."""
 
-from utils import cross, area_signed
+from functools import partial
 
+import numpy as np
 
-def enveloppe_monotone(points):
-    """Etapes: 1/tri unique 2/chaine basse 3/chaine haute 4/fusion."""
-    P = sorted(set(tuple(p) for p in points))
+from algorithms.entiers import coordonnees, en_entiers
+from algorithms.filtre import appliquer_filtre, masque_akl_toussaint
+from algorithms.pointset import PointSet
+from algorithms.predicats import orient, orient_lot, surement_a_gauche
+
+
+def enveloppe_monotone(points, prefilter=False, echelle=None):
+    """
+    Etapes: 0/pre-filtre optionnel 1/tri unique 2/chaine basse 3/chaine haute 4/fusion.
+
+    echelle (mode entier): points ramenes sur la grille de pas 1/echelle, calcul
+    en entiers exacts, sommets rendus dans les unites d'origine (voir entiers).
+    """
+    if echelle is not None:
+        return en_entiers(partial(enveloppe_monotone, prefilter=prefilter), points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    if isinstance(points, PointSet):
+        P = points.tuples_tries()  # Tri et dedoublonnage deja faits une fois pour toutes.
+    else:
+        P = sorted(set(tuple(p) for p in points))
     if len(P) <= 1:
         return P
 
     # Construction de la chaine inferieure (balaye gauche -> droite).
     lower = []
     for p in P:
-        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+        while len(lower) >= 2 and orient(lower[-2], lower[-1], p) <= 0:
             # Supprime les virages a droite pour conserver la convexite.
             lower.pop()
         lower.append(p)
@@ -20,12 +38,182 @@ def enveloppe_monotone(points):
     # Construction de la chaine superieure (balaye droite -> gauche).
     upper = []
     for p in reversed(P):
-        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+        while len(upper) >= 2 and orient(upper[-2], upper[-1], p) <= 0:
             upper.pop()
         upper.append(p)
 
-    enveloppe = lower[:-1] + upper[:-1]
-    # Reoriente le polygone en sens anti-horaire si besoin.
-    if area_signed(enveloppe) < 0:
-        enveloppe.reverse()
-    return enveloppe
+    # Avec orient exact, les deux chaines ne gardent que des virages a gauche:
+    # le polygone est deja anti-horaire (une aire flottante pourrait le nier).
+    return lower[:-1] + upper[:-1]
+
+
+def enveloppe_monotone_indices(points):
+    """
+    Variante vectorisee de Monotone Chain pour un tableau (n, 2) de float64.
+
+    Accepte un ndarray ou tout objet exposant le protocole buffer (memoryview,
+    array('d'), ...) sans copie lorsque les donnees sont deja en float64, ou un
+    PointSet dont l'ordre lexicographique memorise remplace le tri.
+    Renvoie les indices des sommets dans l'entree, en sens anti-horaire et en
+    commencant par le point lexicographiquement minimal (meme convention que
+    enveloppe_monotone).
+    """
+    pts = _tableau(points)
+    if len(pts) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    x = pts[:, 0]
+    y = pts[:, 1]
+    # Elagage vectorise (Akl-Toussaint) des points strictement interieurs,
+    # avant le tri et la passe sequentielle sur la pile.
+    garde = masque_akl_toussaint(x, y)
+
+    if isinstance(points, PointSet):
+        # Ordre deja trie et dedoublonne: il suffit d'en retirer les points elimines.
+        ordre = points.indices_tries()
+        ordre = ordre[garde[ordre]]
+    else:
+        # Tri lexicographique (x, y) puis dedoublonnage en bloc; lexsort est stable,
+        # on garde donc la premiere occurrence de chaque doublon.
+        candidats = np.flatnonzero(garde)
+        ordre = candidats[np.lexsort((y[candidats], x[candidats]))]
+        unique = np.ones(len(ordre), dtype=bool)
+        unique[1:] = (x[ordre[1:]] != x[ordre[:-1]]) | (y[ordre[1:]] != y[ordre[:-1]])
+        ordre = ordre[unique]
+    if len(ordre) == 1:
+        return ordre
+    xs = x[ordre]
+    ys = y[ordre]
+
+    # Separation par la droite gauche -> droite: chaine basse ou haute. Un point
+    # trop proche de la droite pour trancher va dans les deux chaines.
+    gauche, droite = (xs[0], ys[0]), (xs[-1], ys[-1])
+    sel_bas = np.flatnonzero(~surement_a_gauche(gauche, droite, xs, ys))
+    sel_haut = np.flatnonzero(~surement_a_gauche(droite, gauche, xs, ys))
+
+    lower = _chaine(xs, ys, sel_bas)
+    upper = _chaine(xs, ys, sel_haut[::-1])
+    return ordre[np.array(lower[:-1] + upper[:-1], dtype=np.intp)]
+
+
+def enveloppes_monotone_groupees(points, decalages):
+    """
+    Enveloppes de nombreux petits groupes en un seul appel (stockage CSR).
+
+    points est un tableau (N, 2) (entier ou flottant) ou les points du groupe g
+    occupent points[decalages[g]:decalages[g + 1]]; decalages (G + 1 entiers
+    croissants, de 0 a N). Renvoie (sommets, decalages_sommets): les sommets
+    concatenes de chaque enveloppe, meme convention que enveloppe_monotone
+    (anti-horaire, depuis le minimum lexicographique, un seul point pour un
+    groupe reduit a un point, aucun pour un groupe vide).
+
+    Un seul tri segmente (voir _tri_segmente) ordonne tous les groupes, puis
+    les chaines basses et hautes de tous les groupes avancent de front: a
+    l'etape t, chaque chaine encore active recoit son t-ieme point et les
+    retraits de pile sont faits par lots avec orient_lot (exact). Le nombre
+    d'operations numpy depend de la taille du plus grand groupe, pas du
+    nombre de groupes.
+    """
+    pts = coordonnees(points)
+    decalages = np.asarray(decalages, dtype=np.intp).reshape(-1)
+    if (len(decalages) == 0 or decalages[0] != 0 or decalages[-1] != len(pts)
+            or np.any(np.diff(decalages) < 0)):
+        raise ValueError("decalages doit croitre de 0 au nombre de points")
+    nb = len(decalages) - 1
+    P, groupe = _tri_segmente(pts, np.repeat(np.arange(nb), np.diff(decalages)))
+    tailles = np.bincount(groupe, minlength=nb)
+    fin = np.cumsum(tailles)
+    debut = fin - tailles
+
+    # Separation par la droite gauche -> droite de chaque groupe (orientation
+    # exacte): chaque chaine ne parcourt que les points de son cote, ceux de la
+    # droite allant dans les deux.
+    pleins = np.flatnonzero(tailles)
+    gauche = np.empty((nb, 2), dtype=P.dtype)
+    droite = np.empty((nb, 2), dtype=P.dtype)
+    gauche[pleins], droite[pleins] = P[debut[pleins]], P[fin[pleins] - 1]
+    cote = orient_lot(gauche[groupe], droite[groupe], P)
+    sel_bas, sel_haut = np.flatnonzero(cote <= 0), np.flatnonzero(cote >= 0)
+    n_bas = np.bincount(groupe[sel_bas], minlength=nb)
+    n_haut = np.bincount(groupe[sel_haut], minlength=nb)
+
+    # Chaines 0..nb-1 basses (gauche -> droite), nb..2nb-1 hautes (droite -> gauche)
+    # sur suite, concatenation des points retenus; la pile de chaque chaine occupe
+    # dans pile la meme tranche que ses points dans suite.
+    suite = np.concatenate((sel_bas, sel_haut))
+    longueurs = np.concatenate((n_bas, n_haut))
+    zone = np.concatenate((np.cumsum(n_bas) - n_bas, len(sel_bas) + np.cumsum(n_haut) - n_haut))
+    premier = np.concatenate((zone[:nb], zone[nb:] + n_haut - 1))
+    sens = np.repeat(np.array([1, -1], dtype=np.intp), nb)
+    hauteur = np.zeros(2 * nb, dtype=np.intp)
+    pile = np.empty(len(suite), dtype=np.intp)
+
+    # Chaines par longueur decroissante: les chaines actives a l'etape t sont un prefixe.
+    rang = np.argsort(-longueurs, kind="stable")
+    actives = np.searchsorted(-longueurs[rang], -np.arange(int(longueurs.max(initial=0))), side="left")
+    for t, nb_actives in enumerate(actives.tolist()):
+        chaines = rang[:nb_actives]
+        p = suite[premier[chaines] + sens[chaines] * t]
+        verifiees = np.flatnonzero(hauteur[chaines] >= 2)
+        while len(verifiees):
+            c = chaines[verifiees]
+            h = zone[c] + hauteur[c]
+            retire = verifiees[orient_lot(P[pile[h - 2]], P[pile[h - 1]], P[p[verifiees]]) <= 0]
+            hauteur[chaines[retire]] -= 1
+            verifiees = retire[hauteur[chaines[retire]] >= 2]
+        pile[zone[chaines] + hauteur[chaines]] = p
+        hauteur[chaines] += 1
+
+    # Enveloppe d'un groupe: chaine basse sans son dernier point, puis chaine haute
+    # sans son dernier point (un groupe d'un seul point garde ce point).
+    bas, haut = hauteur[:nb], hauteur[nb:]
+    nb_bas = np.where(tailles == 0, 0, np.maximum(bas - 1, 1))
+    nb_haut = np.maximum(haut - 1, 0)
+    sortie = np.concatenate(([0], np.cumsum(nb_bas + nb_haut))).astype(np.intp)
+    g = np.repeat(np.arange(nb), nb_bas + nb_haut)
+    local = np.arange(sortie[-1]) - sortie[g]
+    source = np.where(local < nb_bas[g], zone[g] + local, zone[g + nb] + local - nb_bas[g])
+    return P[pile[source]], sortie
+
+
+def _tri_segmente(pts, groupe):
+    """
+    Trie les points par (groupe, x, y) et retire les doublons de chaque groupe.
+
+    Un lexsort a trois cles est lent sur des millions de points: le rang global
+    des x (un argsort) forme avec le groupe une cle entiere unique, triee en un
+    seul argsort. Seuls les paquets d'egalite de x sont ensuite retries par y.
+    """
+    n = len(pts)
+    x, y = pts[:, 0], pts[:, 1]
+    rang_x = np.empty(n, dtype=np.int64)
+    rang_x[np.argsort(x)] = np.arange(n)
+    ordre = np.argsort(groupe.astype(np.int64) * n + rang_x)
+    g, xs = groupe[ordre], x[ordre]
+    egaux = (g[1:] == g[:-1]) & (xs[1:] == xs[:-1])
+    if egaux.any():
+        paquets = np.zeros(n, dtype=bool)
+        paquets[:-1] |= egaux
+        paquets[1:] |= egaux
+        sel = ordre[paquets]
+        ordre[paquets] = sel[np.lexsort((y[sel], x[sel], groupe[sel]))]
+    P, g = pts[ordre], groupe[ordre]
+    unique = np.ones(n, dtype=bool)
+    unique[1:] = (g[1:] != g[:-1]) | (P[1:] != P[:-1]).any(axis=1)
+    return P[unique], g[unique]
+
+
+def _tableau(points):
+    """Vue (n, 2) en float64 sur l'entree, sans copie si le type convient deja."""
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def _chaine(xs, ys, selection):
+    """Passe de pile d'Andrew sur les positions selectionnees (deja triees)."""
+    P = list(zip(xs[selection].tolist(), ys[selection].tolist()))
+    pile = []
+    for k, p in enumerate(P):
+        while len(pile) >= 2 and orient(P[pile[-2]], P[pile[-1]], p) <= 0:
+            pile.pop()
+        pile.append(k)
+    return [int(selection[k]) for k in pile]
@@ -0,0 +1,77 @@
+"""Execution multi-coeurs des niveaux hauts des algorithmes diviser-pour-regner."""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithms.pointset import PointSet
+
+# En dessous de ce nombre de points par processus, le cout du pool domine.
+_MIN_PAR_WORKER = 20000
+
+
+def enveloppe_parallele(points, workers, feuille, fusion):
+    """
+    Calcule une sous-coque racine en repartissant les plages triees sur un pool.
+
+    Les points sont tries et dedoublonnes une seule fois (lexsort numpy) puis
+    copies en memoire partagee: chaque worker lit sa plage sans pickling et
+    renvoie seulement sa sous-coque, calculee par feuille(pts, lo, hi).
+    Le parent fusionne ensuite les sous-coques voisines deux a deux avec
+    fusion(gauche, droite). Les coordonnees sont manipulees en float.
+    """
+    coords = _trie_unique(points)
+    n = len(coords)
+    parts = min(workers, n // _MIN_PAR_WORKER)
+    if parts <= 1:
+        return feuille(list(map(tuple, coords.tolist())), 0, n)
+
+    shm = shared_memory.SharedMemory(create=True, size=coords.nbytes)
+    try:
+        np.ndarray(coords.shape, dtype=np.float64, buffer=shm.buf)[:] = coords
+        del coords
+        bornes = [n * k // parts for k in range(parts + 1)]
+        with ProcessPoolExecutor(max_workers=parts) as pool:
+            coques = list(pool.map(
+                _calcule_plage,
+                [shm.name] * parts,
+                [n] * parts,
+                bornes[:-1],
+                bornes[1:],
+                [feuille] * parts,
+            ))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # Arbre de fusion equilibre: les plages restent dans l'ordre lexicographique.
+    while len(coques) > 1:
+        fusionnees = [fusion(coques[k], coques[k + 1]) for k in range(0, len(coques) - 1, 2)]
+        if len(coques) % 2:
+            fusionnees.append(coques[-1])
+        coques = fusionnees
+    return coques[0]
+
+
+def _trie_unique(points):
+    """Tableau (n, 2) float64 trie par (x, y) et sans doublons."""
+    if isinstance(points, PointSet):
+        return points.tries()
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    pts = pts[np.lexsort((pts[:, 1], pts[:, 0]))]
+    unique = np.ones(len(pts), dtype=bool)
+    unique[1:] = np.any(pts[1:] != pts[:-1], axis=1)
+    return pts[unique]
+
+
+def _calcule_plage(nom, n, lo, hi, feuille):
+    """Tache d'un worker: lit pts[lo:hi] en memoire partagee et calcule sa coque."""
+    shm = shared_memory.SharedMemory(name=nom)
+    try:
+        coords = np.ndarray((n, 2), dtype=np.float64, buffer=shm.buf)
+        pts = list(map(tuple, coords[lo:hi].tolist()))
+        del coords
+    finally:
+        shm.close()
+    return feuille(pts, 0, hi - lo)
@@ -0,0 +1,137 @@
+"""Nuage de points compact (colonnes numpy) qui memorise son ordre lexicographique."""
+
+import hashlib
+
+import numpy as np
+
+
+class PointSet:
+    """
+    Nuage de points stocke en deux colonnes float64 (16 octets par point).
+
+    L'ordre lexicographique (x, y) et le masque des doublons sont calcules au
+    premier besoin puis conserves: plusieurs algorithmes appliques au meme
+    PointSet ne paient le tri qu'une fois. Le nuage est immuable; iterer dessus
+    donne des tuples (x, y), comme une liste de points.
+    """
+
+    def __init__(self, points=()):
+        if isinstance(points, PointSet):
+            # Colonnes immuables: partagees, tout comme l'ordre deja calcule.
+            self.x, self.y = points.x, points.y
+            self._ordre, self._unique = points._ordre, points._unique
+        else:
+            coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+            self.x = coords[:, 0].copy()
+            self.y = coords[:, 1].copy()
+            self.x.flags.writeable = False
+            self.y.flags.writeable = False
+            self._ordre = None  # Indices tries par (x, y), doublons compris.
+            self._unique = None  # Premiere occurrence de chaque point, dans l'ordre trie.
+        self._coords = None
+        self._tuples = None
+        self._empreinte = None
+
+    @classmethod
+    def depuis_colonnes(cls, x, y):
+        """Construit un PointSet a partir de deux colonnes de coordonnees."""
+        return cls(np.column_stack((np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))))
+
+    def __len__(self):
+        return len(self.x)
+
+    def __iter__(self):
+        return zip(self.x.tolist(), self.y.tolist())
+
+    def __getitem__(self, k):
+        return (float(self.x[k]), float(self.y[k]))
+
+    def __array__(self, dtype=None, copy=None):
+        coords = self.coords
+        if dtype is not None and np.dtype(dtype) != coords.dtype:
+            return coords.astype(dtype)
+        return coords.copy() if copy else coords
+
+    def __repr__(self):
+        return f"PointSet({len(self)} points)"
+
+    @property
+    def coords(self):
+        """Tableau (n, 2) en lecture seule, construit une fois."""
+        if self._coords is None:
+            self._coords = np.column_stack((self.x, self.y))
+            self._coords.flags.writeable = False
+        return self._coords
+
+    @property
+    def ordre(self):
+        """Permutation qui trie les points par (x, y); stable, doublons compris."""
+        if self._ordre is None:
+            self._ordre = np.lexsort((self.y, self.x))
+        return self._ordre
+
+    @property
+    def unique(self):
+        """Masque, dans l'ordre trie, de la premiere occurrence de chaque point."""
+        if self._unique is None:
+            self._unique = _premiers(self.x[self.ordre], self.y[self.ordre])
+        return self._unique
+
+    def indices_tries(self):
+        """Indices des points distincts, tries par (x, y)."""
+        return self.ordre[self.unique]
+
+    def tries(self):
+        """Tableau (m, 2) des points distincts tries par (x, y)."""
+        return self.coords[self.indices_tries()]
+
+    def tuples_tries(self):
+        """Liste partagee (a ne pas modifier) des points distincts tries, en tuples."""
+        if self._tuples is None:
+            tries = self.tries()
+            self._tuples = list(zip(tries[:, 0].tolist(), tries[:, 1].tolist()))
+        return self._tuples
+
+    def empreinte(self):
+        """Empreinte du contenu (empreinte_tableau), calculee une fois."""
+        if self._empreinte is None:
+            self._empreinte = empreinte_tableau(self.coords)
+        return self._empreinte
+
+    def sous_ensemble(self, masque):
+        """PointSet des points gardes par masque; l'ordre deja calcule est reutilise."""
+        masque = np.asarray(masque, dtype=bool)
+        sous = PointSet.__new__(PointSet)
+        sous.x = self.x[masque]
+        sous.y = self.y[masque]
+        sous.x.flags.writeable = False
+        sous.y.flags.writeable = False
+        sous._coords = sous._tuples = sous._empreinte = None
+        sous._ordre = sous._unique = None
+        if self._ordre is not None:
+            # Rang de chaque point garde dans le sous-ensemble, puis restriction de l'ordre.
+            rang = np.cumsum(masque) - 1
+            gardes = masque[self._ordre]
+            sous._ordre = rang[self._ordre[gardes]]
+        return sous
+
+
+def empreinte_tableau(tableau):
+    """
+    Empreinte blake2b (hexadecimale) d'un tableau (n, 2): type, forme et tampon.
+    Les types non numeriques passent en float64.
+    """
+    if tableau.dtype.kind not in "iuf":
+        tableau = tableau.astype(np.float64)
+    tableau = np.ascontiguousarray(tableau).reshape(-1, 2)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{tableau.dtype.str}{tableau.shape}".encode())
+    h.update(memoryview(tableau).cast("B"))
+    return h.hexdigest()
+
+
+def _premiers(xs, ys):
+    """Masque des premieres occurrences dans des coordonnees deja triees."""
+    unique = np.ones(len(xs), dtype=bool)
+    unique[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+    return unique
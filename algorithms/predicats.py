@@ -0,0 +1,234 @@
+"""Predicats geometriques robustes: orientation filtree en flottants, exacte au besoin."""
+
+from fractions import Fraction
+from math import fsum, isfinite, lcm
+
+import numpy as np
+
+# Borne d'erreur statique de Shewchuk pour orient2d (ccwerrboundA): l'erreur d'arrondi
+# du determinant flottant est majoree par _BORNE * (|terme gauche| + |terme droit|).
+_EPSILON = 2.0 ** -53
+_BORNE = (3.0 + 16.0 * _EPSILON) * _EPSILON
+
+# Sous ce seuil, un produit (ou l'un de ses termes de Dekker) peut perdre des bits
+# par sous-depassement: les transformations sans erreur ne sont plus exactes.
+_PLANCHER = 2.0 ** -960
+
+# Coordonnees entieres: si |v| < 2**30, les differences restent sous 2**31, les
+# produits sous 2**62 et leur difference sous 2**63; le determinant int64 est exact.
+_BORNE_INT64 = 2 ** 30
+
+
+def orient(a, b, c):
+    """
+    Determinant d'orientation de (a, b, c) dont le signe est garanti exact:
+    > 0 virage a gauche, < 0 virage a droite, 0 points alignes.
+
+    Meme valeur que utils.cross(a, b, c) tant que le calcul flottant depasse sa
+    borne d'erreur statique (cas courant, presque aussi rapide que cross); sinon
+    le signe est recalcule exactement par orient_exact et la valeur renvoyee vaut
+    -1, 0 ou 1. Des coordonnees entieres (int Python) donnent directement un
+    determinant exact.
+    """
+    ax, ay = a
+    gauche = (b[0] - ax) * (c[1] - ay)
+    droite = (b[1] - ay) * (c[0] - ax)
+    det = gauche - droite
+    if abs(det) > _BORNE * (abs(gauche) + abs(droite)) or type(det) is int:
+        return det
+    if ((ax == b[0] or ay == c[1]) and (ay == b[1] or ax == c[0])
+            or b[0] == c[0] and b[1] == c[1]):
+        # Determinant nul sans arrondi: points confondus ou alignes sur un axe.
+        return 0
+    return orient_exact(a, b, c)
+
+
+def orient_exact(a, b, c):
+    """Signe (-1, 0 ou 1) de l'orientation, calcule sans arrondi."""
+    return croix_exacte(a, b, a, c)
+
+
+def croix_exacte(a, b, c, d):
+    """
+    Signe (-1, 0 ou 1) du produit vectoriel (b - a) x (d - c), calcule sans
+    arrondi (orient_exact(a, b, c) est croix_exacte(a, b, a, c)).
+    """
+    coords = (a[0], a[1], b[0], b[1], c[0], c[1], d[0], d[1])
+    if all(isinstance(v, float) for v in coords):
+        signe = _signe_flottant(*coords)
+        if signe is not None:
+            return signe
+    return _signe_entier(*coords)
+
+
+def _signe_flottant(ax, ay, bx, by, cx, cy, dx, dy):
+    """
+    Signe exact par transformations sans erreur, ou None si une difference de
+    coordonnees est elle-meme arrondie: chaque produit devient une somme exacte
+    de deux flottants (Dekker) et fsum arrondit correctement leur total.
+    """
+    u = bx - ax
+    v = dy - cy
+    w = by - ay
+    z = dx - cx
+    if _reste(bx, ax, u) or _reste(dy, cy, v) or _reste(by, ay, w) or _reste(dx, cx, z):
+        return None
+    p = u * v
+    q = w * z
+    if (u and v and abs(p) < _PLANCHER) or (w and z and abs(q) < _PLANCHER):
+        return None  # Sous-depassement: produit ou terme d'erreur arrondi.
+    uh, ul = _moities(u)
+    vh, vl = _moities(v)
+    wh, wl = _moities(w)
+    zh, zl = _moities(z)
+    ep = ((uh * vh - p) + uh * vl + ul * vh) + ul * vl
+    eq = ((wh * zh - q) + wh * zl + wl * zh) + wl * zl
+    if not (isfinite(ep) and isfinite(eq)):
+        return None  # Debordement du decoupage pour des coordonnees enormes.
+    det = fsum((p, ep, -q, -eq))
+    return (det > 0) - (det < 0)
+
+
+def _reste(x, y, s):
+    # Erreur d'arrondi de s = x - y (TwoSum de Knuth), nulle si s est exact.
+    t = s - x
+    return (x - (s - t)) - (y + t)
+
+
+def _moities(x):
+    # Decoupage de Veltkamp: x = haut + bas, chaque moitie sur 26 bits au plus.
+    c = 134217729.0 * x
+    haut = c - (c - x)
+    return haut, x - haut
+
+
+def _signe_entier(*coords):
+    """Dernier recours: coordonnees ramenees a des entiers sur un denominateur commun."""
+    ratios = [_ratio(v) for v in coords]
+    commun = lcm(*(den for _, den in ratios))
+    ax, ay, bx, by, cx, cy, dx, dy = (num * (commun // den) for num, den in ratios)
+    det = (bx - ax) * (dy - cy) - (by - ay) * (dx - cx)
+    return (det > 0) - (det < 0)
+
+
+def orient_lot(a, b, c):
+    """
+    Signes exacts de l'orientation sur des lots: a, b, c sont des tableaux (n, 2)
+    ou des points (2,) diffuses par numpy. Renvoie un tableau int8 de -1, 0, 1.
+
+    Les determinants sous la borne d'erreur sont d'abord reexamines en bloc: si
+    les differences et les produits y sont exacts (cas des grilles et des points
+    alignes), le signe flottant est deja le bon. Seul le reste passe par
+    orient_exact. Des lots entiers sont calcules en entiers (voir _croix_lot_entier).
+    """
+    return croix_lot(a, b, a, c)
+
+
+def croix_lot(a, b, c, d):
+    """
+    Version par lots de croix_exacte: signes exacts de (b - a) x (d - c), meme
+    filtre que orient_lot (la borne de Shewchuk vaut pour deux differences par
+    produit). Compare par exemple deux pentes, ou deux hauteurs le long d'une
+    direction b - a, sans passer par une division arrondie.
+    """
+    a, b, c, d = np.asarray(a), np.asarray(b), np.asarray(c), np.asarray(d)
+    if _entier(a) and _entier(b) and _entier(c) and _entier(d):
+        return _croix_lot_entier(a, b, c, d)
+    a = a.astype(np.float64, copy=False)
+    b = b.astype(np.float64, copy=False)
+    c = c.astype(np.float64, copy=False)
+    d = d.astype(np.float64, copy=False)
+    gauche = (b[..., 0] - a[..., 0]) * (d[..., 1] - c[..., 1])
+    droite = (b[..., 1] - a[..., 1]) * (d[..., 0] - c[..., 0])
+    det = gauche - droite
+    signes = np.sign(det).astype(np.int8)
+    douteux = np.flatnonzero(~(np.abs(det) > _BORNE * (np.abs(gauche) + np.abs(droite))))
+    if len(douteux) == 0:
+        return signes
+
+    A, B, C, D = (_lignes(t, det.shape, douteux) for t in (a, b, c, d))
+    # Vecteur nul ou vecteurs identiques (deux points confondus pour orient_lot):
+    # determinant nul sans arrondi, comme dans orient. Cas courant (un point
+    # compare a lui-meme), ecarte avant les tests plus couteux.
+    nuls = ((A == B).all(axis=1) | (C == D).all(axis=1)
+            | ((A == C).all(axis=1) & (B == D).all(axis=1)))
+    if nuls.all():
+        return signes
+    douteux, A, B, C, D = douteux[~nuls], A[~nuls], B[~nuls], C[~nuls], D[~nuls]
+    with np.errstate(over="ignore", invalid="ignore"):
+        # Un debordement donne inf ou nan: le triplet n'est pas retenu comme exact.
+        exacts = (_difference_exacte(B[:, 0], A[:, 0]) & _difference_exacte(D[:, 1], C[:, 1])
+                  & _difference_exacte(B[:, 1], A[:, 1]) & _difference_exacte(D[:, 0], C[:, 0])
+                  & _produit_exact(B[:, 0] - A[:, 0], D[:, 1] - C[:, 1])
+                  & _produit_exact(B[:, 1] - A[:, 1], D[:, 0] - C[:, 0]))
+    plat = signes.reshape(-1)
+    for k in np.flatnonzero(~exacts).tolist():
+        plat[douteux[k]] = croix_exacte(A[k].tolist(), B[k].tolist(), C[k].tolist(), D[k].tolist())
+    return signes
+
+
+def _lignes(t, forme, douteux):
+    """Points de t (diffuse a la forme du lot) aux positions douteux, en (k, 2)."""
+    if t.size == 2:
+        return t.reshape(1, 2)[np.zeros(len(douteux), dtype=np.intp)]
+    if t.shape[:-1] != forme:
+        t = np.broadcast_to(t, forme + (2,))
+    return t.reshape(-1, 2)[douteux]
+
+
+def _entier(t):
+    # Les tableaux d'objets ne viennent que de entiers.quantifier (int Python).
+    return t.dtype.kind in "iu" or t.dtype == object
+
+
+def _croix_lot_entier(a, b, c, d):
+    """
+    Determinants exacts sur des coordonnees entieres: en int64 sous _BORNE_INT64,
+    en int Python (tableaux d'objets) au-dela, ou un int64 pourrait deborder.
+    """
+    if all(t.dtype.kind in "iu" and (t.size == 0 or np.abs(t).max() < _BORNE_INT64) for t in (a, b, c, d)):
+        a, b, c, d = (t.astype(np.int64, copy=False) for t in (a, b, c, d))
+    else:
+        a, b, c, d = (t.astype(object) for t in (a, b, c, d))
+    det = ((b[..., 0] - a[..., 0]) * (d[..., 1] - c[..., 1])
+           - (b[..., 1] - a[..., 1]) * (d[..., 0] - c[..., 0]))
+    return (det > 0).astype(np.int8) - (det < 0).astype(np.int8)
+
+
+def surement_a_gauche(a, b, xs, ys):
+    """
+    Masque des points (xs, ys) dont le filtre flottant garantit qu'ils sont
+    strictement a gauche de a->b. Les cas douteux valent False: a reserver aux
+    elagages conservateurs, qui peuvent garder un point de trop sans se tromper.
+    """
+    gauche = (b[0] - a[0]) * (ys - a[1])
+    droite = (b[1] - a[1]) * (xs - a[0])
+    det = gauche - droite
+    return det > _BORNE * (np.abs(gauche) + np.abs(droite))
+
+
+def _difference_exacte(x, y):
+    """Masque des x - y calcules sans arrondi."""
+    return _reste(x, y, x - y) == 0
+
+
+def _produit_exact(x, y):
+    """
+    Masque des x * y calcules sans arrondi (erreur nulle de TwoProduct de Dekker).
+    Un produit sous-depassant _PLANCHER n'est jamais retenu: son terme d'erreur
+    peut lui-meme etre arrondi a zero.
+    """
+    p = x * y
+    xh, xl = _moities(x)
+    yh, yl = _moities(y)
+    sous_depassement = (x != 0) & (y != 0) & (np.abs(p) < _PLANCHER)
+    return (((xh * yh - p) + xh * yl + xl * yh) + xl * yl == 0) & ~sous_depassement
+
+
+def _ratio(v):
+    if isinstance(v, np.integer):
+        return int(v), 1
+    try:
+        return v.as_integer_ratio()
+    except AttributeError:
+        return Fraction(v).as_integer_ratio()
@@ -1,93 +1,137 @@
 """Algorithme de Preparata-Hong avec fusion par tangentes."""
 
-from math import fsum
+from functools import partial
+from typing import NamedTuple
 
+import numpy as np
+
+from algorithms.entiers import en_entiers
+from algorithms.filtre import appliquer_filtre
 from algorithms.monotone import enveloppe_monotone
+from algorithms.parallele import enveloppe_parallele
+from algorithms.pointset import PointSet
+from algorithms.predicats import orient
 from utils import area_signed
 
 _EPS = 1e-12
 
 
-def preparata_hong(points, seuil=32):
+def preparata_hong(points, seuil=32, prefilter=False, workers=1, echelle=None):
     """
     Calcule l'enveloppe convexe par l'algorithme Preparata-Hong.
 
     Complexite temporelle: T(n) = 2T(n/2) + O(n) => O(n log n) avec seuil constant.
     Complexite spatiale: O(n) pour stocker les sous-coques et pour la recursion.
+    prefilter=True elimine d'abord les points interieurs (Akl-Toussaint).
+    workers > 1 repartit les niveaux hauts de la recursion sur un pool de processus.
+    echelle active le mode entier: les coordonnees quantifiees restent des entiers,
+    orientations et test de degenerescence sont alors exacts (voir entiers.en_entiers).
     """
-    pts = sorted({(float(p[0]), float(p[1])) for p in points})
+    if echelle is not None:
+        return en_entiers(partial(preparata_hong, seuil=seuil, prefilter=prefilter, workers=workers),
+                          points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    if isinstance(points, np.ndarray):
+        # Scalaires Python (tolist garde les entiers exacts), comme pour une liste.
+        points = points.reshape(-1, 2).tolist()
+    if workers > 1:
+        return enveloppe_parallele(points, workers, partial(_divide, seuil=seuil), _merge).sommets
+
+    if isinstance(points, PointSet):
+        pts = points.tuples_tries()
+    else:
+        # Pas de conversion en float: des coordonnees entieres restent exactes.
+        pts = sorted({(p[0], p[1]) for p in points})
     if len(pts) <= 1:
         return pts
     if len(pts) <= seuil:
         return enveloppe_monotone(pts)
 
-    enveloppe = _divide(pts, seuil)
-    if len(enveloppe) > 2 and area_signed(enveloppe) < 0:
-        # Assure une sortie en sens anti-horaire quel que soit le chemin recursif.
-        enveloppe.reverse()
-    return enveloppe
+    # Chaque sous-coque est deja en sens anti-horaire: aucune reorientation finale.
+    return _divide(pts, 0, len(pts), seuil).sommets
 
 
-def _divide(pts, seuil):
-    if len(pts) <= seuil:
-        return enveloppe_monotone(pts)  # Cas de base: traitement lineaire par Monotone.
+class _Coque(NamedTuple):
+    """Sous-coque en sens anti-horaire; sommets[0] est son point le plus a gauche."""
+
+    sommets: list
+    droite: int  # Indice du point le plus a droite (x max, puis y max).
+    degeneree: bool  # Aire quasi nulle: les tangentes ne sont pas fiables.
+
+
+def _coque(sommets):
+    """Construit l'enregistrement d'une coque issue de enveloppe_monotone."""
+    degeneree = len(sommets) <= 2 or abs(area_signed(sommets)) <= _EPS
+    return _Coque(sommets, _plus_a_droite(sommets), degeneree)
 
-    mid = len(pts) // 2
-    left = _divide(pts[:mid], seuil)
-    right = _divide(pts[mid:], seuil)
+
+def _divide(pts, lo, hi, seuil):
+    if hi - lo <= seuil:
+        return _coque(enveloppe_monotone(pts[lo:hi]))  # Cas de base: traitement lineaire par Monotone.
+
+    mid = (lo + hi) // 2
+    left = _divide(pts, lo, mid, seuil)
+    right = _divide(pts, mid, hi, seuil)
     return _merge(left, right)  # Fusion des deux enveloppes partielles.
 
 
 def _merge(left, right):
     """Fusionne deux enveloppes locales en une coque globale via tangentes communes."""
-    if not left:
-        return right[:]
-    if not right:
-        return left[:]
-    if len(left) <= 2 or len(right) <= 2:
-        return enveloppe_monotone(left + right)
-    if abs(area_signed(left)) <= _EPS or abs(area_signed(right)) <= _EPS:
-        return enveloppe_monotone(left + right)
-
-    if len(left) > 2 and area_signed(left) < 0:
-        # Garantit une orientation anti-horaire avant de chercher les tangentes.
-        left = list(reversed(left))
-    if len(right) > 2 and area_signed(right) < 0:
-        right = list(reversed(right))
+    if left.degeneree or right.degeneree:
+        # Sous-coque degeneree (points alignes): on recalcule sur peu de sommets.
+        return _coque(enveloppe_monotone(left.sommets + right.sommets))
 
     ui, uj = _upper_tangent(left, right)
     li, lj = _lower_tangent(left, right)
-
-    merged = []
-
-    # Ajoute les sommets de la coque gauche entre les tangentes (sens direct CCW).
-    idx = ui
-    merged.append(left[idx])
-    while idx != li:
-        idx = (idx + 1) % len(left)
-        merged.append(left[idx])
-
-    # Ajoute la coque droite de la tangente basse vers la tangente haute.
-    idx = lj
-    if not merged or right[idx] != merged[-1]:
-        merged.append(right[idx])
-    while idx != uj:
-        idx = (idx + 1) % len(right)
-        if right[idx] != merged[-1]:
-            merged.append(right[idx])
-
-    if len(merged) > 2 and area_signed(merged) < 0:
-        merged.reverse()
-    return merged
+    gauche = left.sommets
+    droite = right.sommets
+
+    # Parcours anti-horaire depuis le point le plus a gauche: coque gauche jusqu'a la
+    # tangente basse, coque droite de la tangente basse a la haute, puis retour a gauche.
+    merged = gauche[:li + 1]
+    decalage = len(merged)
+    if uj >= lj:
+        merged += droite[lj:uj + 1]
+    else:
+        merged += droite[lj:] + droite[:uj + 1]
+    if ui > 0:
+        merged += gauche[ui:]
+
+    # Le point le plus a droite de la coque droite reste le plus a droite de la fusion;
+    # l'aire fusionnee majore celle des deux coques, elle ne peut donc etre degeneree.
+    droite_fusion = decalage + (right.droite - lj) % len(droite)
+    # Seules les jonctions peuvent etre alignees: les sous-coques n'ont pas de
+    # sommets alignes. La passe complete ne sert que si l'une d'elles l'est.
+    n = len(merged)
+    fin_droite = decalage + (uj - lj) % len(droite)
+    for k in (decalage - 1, decalage, fin_droite, (fin_droite + 1) % n):
+        if orient(merged[k - 1], merged[k], merged[(k + 1) % n]) == 0:
+            return _sans_alignes(merged, droite_fusion)
+    return _Coque(merged, droite_fusion, False)
+
+
+def _sans_alignes(sommets, droite):
+    """
+    Retire les sommets alignes avec leurs voisins. Les tangentes s'arretent sur
+    le premier de deux sommets alignes (orient nul), ce qui peut en laisser aux
+    jonctions de la fusion (grilles). Passe lineaire, comme la fusion.
+    """
+    garde = []
+    for k, p in enumerate(sommets):
+        while len(garde) >= 2 and orient(sommets[garde[-2]], sommets[garde[-1]], p) == 0:
+            garde.pop()
+        garde.append(k)
+    # Fermeture: sommets[0], minimum lexicographique, est toujours un vrai sommet.
+    while len(garde) >= 3 and orient(sommets[garde[-2]], sommets[garde[-1]], sommets[0]) == 0:
+        garde.pop()
+    if len(garde) == len(sommets):
+        return _Coque(sommets, droite, False)
+    nettoye = [sommets[k] for k in garde]
+    return _Coque(nettoye, garde.index(droite) if droite in garde else _plus_a_droite(nettoye), False)
 
 
-def _orient(a, b, c):
-    """Determinant signe de (a,b,c); >0 pour virage gauche, <0 pour virage droit."""
-    ax = b[0] - a[0]
-    ay = b[1] - a[1]
-    bx = c[0] - a[0]
-    by = c[1] - a[1]
-    return fsum((ax * by, -ay * bx))
+def _plus_a_droite(sommets):
+    return max(range(len(sommets)), key=lambda k: sommets[k], default=0)
 
 
 def _upper_tangent(left, right):
@@ -100,10 +144,13 @@ def _lower_tangent(left, right):
     return _tangent(left, right, upper=False)
 
 
-def _tangent(left, right, upper):
+def _tangent(coque_gauche, coque_droite, upper):
     """Balaye circulairement chaque coque jusqu'a stabilisation des tangentes."""
-    i = _rightmost_index(left)
-    j = _leftmost_index(right)
+    left = coque_gauche.sommets
+    right = coque_droite.sommets
+    # Les extremites connues des enregistrements evitent tout balayage initial.
+    i = coque_gauche.droite
+    j = 0
     n = len(left)
     m = len(right)
 
@@ -137,18 +184,6 @@ def _tangent(left, right, upper):
 
 
 def _orient_sign(a, b, c):
-    """Renvoie -1, 0 ou 1 selon l'orientation avec tolerance numerique."""
-    val = _orient(a, b, c)
-    if abs(val) <= _EPS:
-        return 0
-    return 1 if val > 0 else -1
-
-
-def _rightmost_index(enveloppe):
-    """Renvoie l'indice du point le plus a droite (x max, puis y max)."""
-    return max(range(len(enveloppe)), key=lambda k: (enveloppe[k][0], enveloppe[k][1]))
-
-
-def _leftmost_index(enveloppe):
-    """Renvoie l'indice du point le plus a gauche (x min, puis y min)."""
-    return min(range(len(enveloppe)), key=lambda k: (enveloppe[k][0], enveloppe[k][1]))
+    """Renvoie -1, 0 ou 1 selon l'orientation, exacte (voir predicats.orient)."""
+    val = orient(a, b, c)
+    return 1 if val > 0 else -1 if val < 0 else 0
@@ -1,52 +1,176 @@
 """Implementation de QuickHull, analogue geometrie du QuickSort."""
 
-import math as m
-from utils import cross, area_signed
-
-def det(A, B, C):
-        return (A[0] - B[0]) * (C[1] - B[1]) - (A[1] - B[1]) * (C[0] - B[0])
-
-def farthest(A, B, pts):
-    # Cherche le point qui maximise la distance orientee a la droite AB.
-    best, dmax = None, 0
-    for p in pts:
-        d = abs(det(A, B, p))
-        if d > dmax:
-            best, dmax = p, d
-    return best
-
-def recurse(A, B, pts):
-    # Portionne recursivement le demi-plan (AB) par le point le plus lointain.
-    pmax = farthest(A, B, pts)
-    if not pmax:
-        return []
-    left1 = [p for p in pts if det(A, pmax, p) > 0]
-    left2 = [p for p in pts if det(pmax, B, p) > 0]
-    return recurse(A, pmax, left1) + [pmax] + recurse(pmax, B, left2)
+from functools import partial
+
+import numpy as np
+
+from algorithms.entiers import coordonnees, en_entiers
+from algorithms.filtre import appliquer_filtre
+from algorithms.pointset import PointSet
+from algorithms.predicats import croix_lot, orient, orient_lot
+
+# Au-dela de cette taille, une partition est traitee en bloc par numpy plutot
+# que point par point en Python.
+_SEUIL_VECTORIEL = 128
 
-    
+# Marge des distances flottantes au segment, en u = 2**-53: deux fois la borne
+# d'erreur ~3u * (|terme gauche| + |terme droit|) du determinant.
+_MARGE = 8 * 2.0 ** -53
+
+
+def enveloppe_quickhull(points, prefilter=False, seuil_vectoriel=_SEUIL_VECTORIEL, echelle=None):
+    """
+    0/pre-filtre optionnel
+    1/pivots extremes
+    2/separation
+    3/recherche point le plus lointain
+    4/fusion.
 
-def enveloppe_quickhull(points):
+    Version iterative: une pile explicite de segments remplace la recursion et les
+    partitions sont faites en place dans un tableau d'indices. Les segments sont
+    depiles dans l'ordre du contour, les sommets sortent donc directement en sens
+    anti-horaire depuis le minimum lexicographique, sans sommets alignes.
+    Les partitions de plus de seuil_vectoriel points sont traitees par numpy.
+    Des coordonnees entieres restent entieres, tests de cote compris; echelle
+    active le mode entier (voir entiers.en_entiers).
     """
-    1/pivots extremes 
-    2/separation 
-    3/recherche point le plus lointain 
-    4/fusion."""
-
-    if len(points) < 3:
-        return points
-
-    # Points les plus a gauche et a droite: base du partitionnement.
-    A = min(points, key=lambda p: (p[0], p[1]))
-    B = max(points, key=lambda p: (p[0], p[1]))
-    left = [p for p in points if det(A, B, p) > 0]
-    right = [p for p in points if det(A, B, p) < 0]
-
-    enveloppe = [A] + recurse(A, B, left) + [B] + recurse(B, A, right)
-
-    # Tri final pour eviter les croisements lors de l'affichage.
-    cx, cy = sum(p[0] for p in enveloppe) / len(enveloppe), sum(p[1] for p in enveloppe) / len(enveloppe)
-    enveloppe = sorted(enveloppe, key=lambda p: m.atan2(p[1] - cy, p[0] - cx))
-    if area_signed(enveloppe) < 0:
-        enveloppe.reverse()
+    if echelle is not None:
+        return en_entiers(partial(enveloppe_quickhull, prefilter=prefilter,
+                                  seuil_vectoriel=seuil_vectoriel), points, echelle)
+    points = appliquer_filtre(points, prefilter)
+    if len(points) == 0:
+        return []
+
+    coords = coordonnees(points)
+    x = coords[:, 0]
+    y = coords[:, 1]
+    ia = _extreme(x, y, np.min)
+    ib = _extreme(x, y, np.max)
+    if x[ia] == x[ib] and y[ia] == y[ib]:
+        # Tous les points sont confondus.
+        return [_sortie(points, coords, ia)]
+
+    # Points strictement sous A->B (chaine basse) puis strictement au-dessus; les
+    # tests de cote sont exacts, comme le choix du point le plus lointain.
+    cote = orient_lot(coords[ia], coords[ib], coords)
+    bas = np.flatnonzero(cote < 0)
+    haut = np.flatnonzero(cote > 0)
+    indices = np.concatenate((bas, haut))
+    P = list(zip(x.tolist(), y.tolist()))
+
+    # Pile de segments (debut, fin, lo, hi): indices[lo:hi] contient les points
+    # strictement a l'exterieur de debut->fin. Le segment A->B est depile en premier.
+    pile = [(ib, ia, len(bas), len(indices)), (ia, ib, 0, len(bas))]
+    enveloppe = []
+    while pile:
+        a, b, lo, hi = pile.pop()
+        if lo == hi:
+            # Plus aucun point exterieur: le debut du segment est un sommet.
+            enveloppe.append(_sortie(points, coords, a))
+            continue
+        if hi - lo > seuil_vectoriel:
+            p, milieu, fin = _partition_vectorielle(indices, lo, hi, a, b, coords)
+        else:
+            p, milieu, fin = _partition(indices, lo, hi, a, b, P, coords)
+        # Le segment p->b est empile d'abord pour que a->p sorte avant lui.
+        pile.append((p, b, milieu, fin))
+        pile.append((a, p, lo, milieu))
     return enveloppe
+
+
+def _extreme(x, y, choix):
+    """Indice du point lexicographiquement minimal (np.min) ou maximal (np.max)."""
+    candidats = np.flatnonzero(x == choix(x))
+    return int(candidats[np.flatnonzero(y[candidats] == choix(y[candidats]))[0]])
+
+
+def _sortie(points, coords, k):
+    # Les points d'une liste sont rendus tels quels; ceux d'un tableau en tuples.
+    if isinstance(points, (np.ndarray, PointSet)):
+        return tuple(coords[k].tolist())
+    return points[k]
+
+
+def _partition(indices, lo, hi, a, b, P, coords):
+    """
+    Cherche le point p le plus eloigne de a->b parmi indices[lo:hi] (voir
+    _plus_loin pour les quasi-egalites) puis reordonne
+    la plage en place: [exterieurs a a->p][exterieurs a p->b][reste elimine].
+    Renvoie (p, milieu, fin) avec ces deux groupes dans [lo, milieu) et [milieu, fin).
+    """
+    plage = indices[lo:hi].tolist()
+    (ax, ay), (bx, by) = P[a], P[b]
+    distances, termes = [], []
+    for k in plage:
+        kx, ky = P[k]
+        gauche = (ax - bx) * (ky - by)
+        droite = (ay - by) * (kx - bx)
+        distances.append(gauche - droite)
+        termes.append(abs(gauche) + abs(droite))
+    loin = max(distances)
+    # Entiers: distances exactes, seules les egalites restent a departager.
+    marge = 0 if type(loin) is int else _MARGE * max(termes)
+    candidats = [i for i, d in enumerate(distances) if not d < loin - marge]
+    if len(candidats) == 1:
+        p = plage[candidats[0]]
+    else:
+        p = _plus_loin(a, b, np.array(plage)[candidats], np.array(distances)[candidats], coords)
+
+    # Exterieur de a->p (resp. p->b): strictement a droite du segment oriente.
+    gauche = [k for k in plage if orient(P[a], P[p], P[k]) < 0]
+    droite = [k for k in plage if orient(P[p], P[b], P[k]) < 0]
+    milieu = lo + len(gauche)
+    fin = milieu + len(droite)
+    indices[lo:fin] = gauche + droite
+    return p, milieu, fin
+
+
+def _partition_vectorielle(indices, lo, hi, a, b, coords):
+    """Meme contrat que _partition, calcule en bloc sur la plage par numpy."""
+    plage = indices[lo:hi]
+    # Distances en flottants: des coordonnees entieres pourraient deborder en int64.
+    xs = coords[plage, 0].astype(np.float64)
+    ys = coords[plage, 1].astype(np.float64)
+    (ax, ay), (bx, by) = coords[a].astype(np.float64), coords[b].astype(np.float64)
+    gauche = (ax - bx) * (ys - by)
+    droite = (ay - by) * (xs - bx)
+    d = gauche - droite
+    if coords.dtype.kind == "f":
+        proches = np.flatnonzero(~(d < d.max() - _MARGE * (np.abs(gauche) + np.abs(droite)).max()))
+    else:
+        # Flottants tires d'entiers eventuellement arrondis: tout est departage exactement.
+        proches = np.arange(len(plage))
+    if len(proches) == 1:
+        p = int(plage[proches[0]])
+    else:
+        p = _plus_loin(a, b, plage[proches], d[proches], coords)
+
+    gauche = plage[orient_lot(coords[a], coords[p], coords[plage]) < 0]
+    droite = plage[orient_lot(coords[p], coords[b], coords[plage]) < 0]
+    milieu = lo + len(gauche)
+    fin = milieu + len(droite)
+    indices[lo:milieu] = gauche
+    indices[milieu:fin] = droite
+    return p, milieu, fin
+
+
+def _plus_loin(a, b, candidats, distances, coords):
+    """
+    Point exactement le plus eloigne de a->b parmi candidats (distances: leurs
+    distances flottantes, pour partir du meilleur). Les ecarts de distance sont
+    compares par predicats.croix_lot. A egalite exacte, les points sont sur une
+    parallele a a->b: le plus avance dans le sens a->b l'emporte, afin de ne
+    jamais retenir le milieu d'une arete (sommet aligne).
+    """
+    sommet = candidats[np.argmax(distances)]
+    while True:
+        # Signe de distance(k) - distance(sommet): (a - b) x (k - sommet).
+        ecart = croix_lot(coords[b], coords[a], coords[sommet], coords[candidats])
+        plus_loin = ecart > 0
+        if not plus_loin.any():
+            break
+        sommet = candidats[plus_loin][np.argmax(distances[plus_loin])]
+    egaux = candidats[ecart == 0]
+    (ax, ay), (bx, by) = coords[a].tolist(), coords[b].tolist()
+    axe, sens = (0, 1 if bx > ax else -1) if bx != ax else (1, 1 if by > ay else -1)
+    return int(egaux[np.argmax(coords[egaux, axe] * sens)])
@@ -0,0 +1,338 @@
+"""Mesures de performance reproductibles: chronometrage, statistiques et persistance.
+
+Utilisation en ligne de commande pour detecter les regressions:
+    python bench.py compare reference.json actuel.json [--seuil 0.10]
+
+executer_grille repartit les cellules independantes d'une campagne (algorithme,
+taille, distribution, parametres) sur un pool de processus et ajoute chaque
+mesure a un fichier JSONL des qu'elle est terminee, ce qui permet de reprendre
+une campagne interrompue.
+"""
+
+import argparse
+import csv
+import gc
+import json
+import multiprocessing as mp
+import os
+import platform
+import statistics as stats
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+from datasets import charger
+
+RESULTS_DIR = Path("resultats")
+
+# Champs qui identifient une mesure (le reste decrit le resultat).
+CLES = ("algo", "n", "distribution", "parametres")
+
+
+def mesurer(func, points, repeat=7, warmup=1, desactiver_gc=True, memoire=False):
+    """
+    Chronometre func(points) avec perf_counter_ns.
+
+    warmup executions non mesurees precedent repeat executions chronometrees; le
+    ramasse-miettes est suspendu pendant chaque mesure (puis une collecte est faite
+    entre deux mesures). Renvoie un dict: mediane_ms, iqr_ms, min_ms, repeat, sommets.
+    Avec memoire, une passe supplementaire hors chronometrage ajoute les champs de
+    mesurer_memoire.
+    """
+    for _ in range(warmup):
+        func(points)
+
+    temps = []
+    gc_actif = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            if desactiver_gc:
+                gc.collect()
+                gc.disable()
+            debut = time.perf_counter_ns()
+            enveloppe = func(points)
+            fin = time.perf_counter_ns()
+            if gc_actif:
+                gc.enable()
+            temps.append((fin - debut) / 1e6)
+    finally:
+        if gc_actif:
+            gc.enable()
+
+    if len(temps) >= 2:
+        q1, _, q3 = stats.quantiles(temps, n=4, method="inclusive")
+    else:
+        q1 = q3 = temps[0]
+    mesure = {
+        "mediane_ms": stats.median(temps),
+        "iqr_ms": q3 - q1,
+        "min_ms": min(temps),
+        "repeat": repeat,
+        "sommets": len(enveloppe),
+    }
+    if memoire:
+        mesure.update(mesurer_memoire(func, points))
+    return mesure
+
+
+def mesurer_memoire(func, points):
+    """
+    Profil memoire d'un appel func(points) avec tracemalloc.
+
+    tracemalloc ralentit fortement les allocations: cette mesure se fait dans un appel
+    separe, jamais pendant le chronometrage. Renvoie un dict: pic_memoire_ko (pic
+    alloue pendant l'appel, au-dela de la memoire deja occupee) et blocs (blocs
+    encore alloues a la sortie de l'appel, resultat compris).
+    """
+    gc.collect()
+    deja_actif = tracemalloc.is_tracing()
+    if not deja_actif:
+        tracemalloc.start()
+    try:
+        # Un appel d'echauffement sous trace remplit les listes libres de l'interpreteur
+        # (tuples, floats...) avec des blocs traces; sans lui, ces blocs recycles
+        # seraient comptes comme retenus par l'appel mesure. Pas de gc.collect() ensuite:
+        # une collecte complete viderait justement ces listes.
+        func(points)
+        avant = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        enveloppe = func(points)
+        _, pic = tracemalloc.get_traced_memory()
+        apres = tracemalloc.take_snapshot()
+    finally:
+        if not deja_actif:
+            tracemalloc.stop()
+    # Les instantanes eux-memes sont alloues sous trace: on les exclut du decompte.
+    exclus = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    ecarts = apres.filter_traces(exclus).compare_to(avant.filter_traces(exclus), "filename")
+    del enveloppe
+    return {
+        "pic_memoire_ko": (pic - base) / 1024,
+        "blocs": sum(stat.count_diff for stat in ecarts),
+    }
+
+
+def metadonnees(seed=None):
+    """Contexte d'execution joint a chaque fichier de resultats."""
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "plateforme": platform.platform(),
+        "cpu": platform.processor() or platform.machine(),
+        "coeurs": os.cpu_count(),
+        "seed": seed,
+    }
+
+
+def ecrire_resultats(chemin, lignes, meta):
+    """Enregistre les mesures en JSON ou en CSV selon l'extension du fichier."""
+    chemin = Path(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    format = chemin.suffix.lstrip(".") if chemin.suffix in (".jsonl", ".csv") else "json"
+    with open(chemin, "w", newline="" if format == "csv" else None) as f:
+        ecrire_flux(f, lignes, meta, format)
+    return chemin
+
+
+def ecrire_flux(flux, lignes, meta, format="json"):
+    """Ecrit les mesures dans un fichier ouvert (sys.stdout par exemple): json, jsonl ou csv."""
+    if format == "jsonl":
+        flux.write(json.dumps({"meta": meta}) + "\n")
+        for ligne in lignes:
+            flux.write(json.dumps(ligne) + "\n")
+    elif format == "csv":
+        colonnes = list(dict.fromkeys(k for ligne in lignes for k in ligne))
+        # Les metadonnees sont gardees en tete sous forme de commentaire JSON.
+        flux.write("# " + json.dumps(meta) + "\n")
+        ecrivain = csv.DictWriter(flux, fieldnames=colonnes)
+        ecrivain.writeheader()
+        ecrivain.writerows(lignes)
+    else:
+        json.dump({"meta": meta, "resultats": lignes}, flux, indent=2)
+        flux.write("\n")
+
+
+def demarrage_a_froid(code="import main", repeat=5):
+    """
+    Temps (ms, minimum sur repeat) d'un interprete neuf qui execute code: demarrage
+    de Python et imports compris. Sert a verifier ce que coute l'import d'un module.
+    """
+    temps = []
+    for _ in range(repeat):
+        debut = time.perf_counter_ns()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parent)
+        temps.append((time.perf_counter_ns() - debut) / 1e6)
+    return min(temps)
+
+
+def lire_resultats(chemin):
+    """Relit un fichier ecrit par ecrire_resultats; renvoie (meta, lignes)."""
+    chemin = Path(chemin)
+    if chemin.suffix == ".jsonl":
+        meta, lignes = {}, []
+        with open(chemin) as f:
+            for texte in f:
+                try:
+                    ligne = json.loads(texte)
+                except json.JSONDecodeError:
+                    # Derniere ligne tronquee par une interruption: ignoree.
+                    continue
+                if "meta" in ligne:
+                    meta = ligne["meta"]
+                else:
+                    lignes.append(ligne)
+        return meta, lignes
+    if chemin.suffix == ".csv":
+        with open(chemin, newline="") as f:
+            premiere = f.readline()
+            meta = json.loads(premiere[2:]) if premiere.startswith("# ") else {}
+            if not premiere.startswith("# "):
+                f.seek(0)
+            lignes = [_convertit(ligne) for ligne in csv.DictReader(f)]
+        return meta, lignes
+    with open(chemin) as f:
+        contenu = json.load(f)
+    return contenu.get("meta", {}), contenu["resultats"]
+
+
+def comparer(reference, actuel, seuil=0.10):
+    """
+    Signale les regressions de actuel par rapport a reference (listes de lignes).
+
+    Une mesure regresse si sa mediane depasse celle de reference de plus de
+    seuil (relatif) et de plus de l'ecart interquartile de reference (bruit).
+    """
+    base = {_cle(ligne): ligne for ligne in reference}
+    regressions = []
+    for ligne in actuel:
+        ref = base.get(_cle(ligne))
+        if ref is None:
+            continue
+        ecart = ligne["mediane_ms"] - ref["mediane_ms"]
+        if ecart > seuil * ref["mediane_ms"] and ecart > ref.get("iqr_ms", 0.0):
+            regressions.append({
+                **{k: ligne[k] for k in CLES if k in ligne},
+                "reference_ms": ref["mediane_ms"],
+                "actuel_ms": ligne["mediane_ms"],
+                "ratio": ligne["mediane_ms"] / ref["mediane_ms"],
+            })
+    return regressions
+
+
+def executer_grille(cellules, chemin, workers=None, repeat=5, meta=None, memoire=False):
+    """
+    Mesure des cellules independantes en parallele et les persiste au fil de l'eau.
+
+    Chaque cellule est un dict avec les cles de CLES, "seed" et "fonction" (appelable
+    picklable: fonction de module ou functools.partial); son nuage est relu dans le
+    processus par datasets.charger (cache .npy projete en memoire). Chaque processus du pool est epingle a un coeur.
+    Les mesures sont ajoutees au fichier JSONL chemin des qu'une cellule se termine;
+    les cellules deja presentes dans chemin sont sautees, ce qui permet de reprendre
+    une campagne interrompue. Avec memoire, chaque ligne recoit aussi le profil
+    memoire de mesurer_memoire. Renvoie toutes les lignes du fichier.
+    """
+    chemin = Path(chemin)
+    faites = set()
+    if chemin.exists():
+        _, lignes = lire_resultats(chemin)
+        faites = {_cle(ligne) for ligne in lignes}
+    restantes = [c for c in cellules if _cle(c) not in faites]
+
+    if not chemin.exists():
+        ecrire_resultats(chemin, [], meta if meta is not None else metadonnees())
+    with open(chemin, "r+") as f:
+        # Une interruption pendant une ecriture laisse une ligne sans fin: on la clot.
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(f.tell() - 1)
+            if f.read(1) != "\n":
+                f.write("\n")
+
+        def enregistre(ligne):
+            f.write(json.dumps(ligne) + "\n")
+            f.flush()
+
+        coeurs = _coeurs_disponibles()
+        workers = min(workers or len(coeurs), len(coeurs), len(restantes))
+        if workers <= 1:
+            for cellule in restantes:
+                enregistre(_mesure_cellule(cellule, repeat, memoire))
+        else:
+            file_coeurs = mp.Queue()
+            for coeur in coeurs[:workers]:
+                file_coeurs.put(coeur)
+            with ProcessPoolExecutor(workers, initializer=_epingle, initargs=(file_coeurs,)) as pool:
+                futurs = [pool.submit(_mesure_cellule, cellule, repeat, memoire) for cellule in restantes]
+                for futur in as_completed(futurs):
+                    enregistre(futur.result())
+
+    return lire_resultats(chemin)[1]
+
+
+def _coeurs_disponibles():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _epingle(file_coeurs):
+    """Initialisation d'un processus du pool: le fixe sur un coeur qui lui est propre."""
+    coeur = file_coeurs.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {coeur})
+
+
+def _mesure_cellule(cellule, repeat, memoire):
+    points = charger(cellule["distribution"], cellule["n"], cellule["seed"]).tolist()
+    mesure = mesurer(cellule["fonction"], points, repeat=repeat, memoire=memoire)
+    ligne = {k: cellule[k] for k in CLES if k in cellule}
+    ligne["seed"] = cellule["seed"]
+    return {**ligne, **mesure}
+
+
+def _cle(ligne):
+    return tuple(str(ligne.get(k, "")) for k in CLES)
+
+
+def _convertit(ligne):
+    """Restaure les nombres d'une ligne CSV."""
+    resultat = {}
+    for k, v in ligne.items():
+        try:
+            resultat[k] = int(v)
+        except ValueError:
+            try:
+                resultat[k] = float(v)
+            except ValueError:
+                resultat[k] = v
+    return resultat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Outils de benchmark des enveloppes convexes.")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    cmp = sous.add_parser("compare", help="compare des resultats a une reference")
+    cmp.add_argument("reference")
+    cmp.add_argument("actuel")
+    cmp.add_argument("--seuil", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    _, reference = lire_resultats(args.reference)
+    _, actuel = lire_resultats(args.actuel)
+    regressions = comparer(reference, actuel, args.seuil)
+    for r in regressions:
+        print(f"REGRESSION {r.get('algo', '?'):<20} n={r.get('n', '?'):<8} "
+              f"{r['reference_ms']:9.2f} ms -> {r['actuel_ms']:9.2f} ms (x{r['ratio']:.2f})")
+    if not regressions:
+        print("Aucune regression detectee.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Cache des enveloppes calculees, adresse par le contenu du nuage de points."""
+
+import hashlib
+import os
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from algorithms.pointset import PointSet, empreinte_tableau
+
+# Cout fixe compte pour chaque entree en plus de ses sommets (cle, tableau numpy).
+_SURCOUT = 200
+
+
+def empreinte(points):
+    """
+    Empreinte du contenu d'un nuage (voir pointset.empreinte_tableau). Un PointSet
+    memorise la sienne; une liste de flottants et un PointSet des memes points ont
+    la meme empreinte.
+    """
+    if isinstance(points, PointSet):
+        return points.empreinte()
+    return empreinte_tableau(np.asarray(points))
+
+
+class CacheEnveloppes:
+    """
+    Memoise les enveloppes par (algorithme, parametres, empreinte du nuage).
+
+    Les entrees sont des tableaux (h, 2); l'eviction est LRU et bornee par
+    max_octets. Avec dossier, chaque enveloppe calculee est aussi ecrite en .npy
+    et relue en cas d'absence en memoire (d'une execution ou d'un processus a
+    l'autre). Les enveloppes sont rendues en listes de tuples neuves.
+    A reserver a l'affichage et a la validation: les mesures de temps appellent
+    toujours les algorithmes directement.
+    """
+
+    def __init__(self, max_octets=64 * 2 ** 20, dossier=None):
+        self.max_octets = max_octets
+        self.dossier = Path(dossier) if dossier is not None else None
+        self.octets = 0
+        self.succes = 0
+        self.echecs = 0
+        self._entrees = OrderedDict()
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def __repr__(self):
+        return (f"CacheEnveloppes({len(self)} entrees, {self.octets} octets, "
+                f"{self.succes} succes, {self.echecs} echecs)")
+
+    def calcule(self, fonction, points, **parametres):
+        """
+        Renvoie fonction(points, **parametres), memoisee. Les arguments nommes d'un
+        functools.partial font partie de la cle, comme parametres.
+        """
+        cle = self.cle(fonction, points, **parametres)
+        if cle is None:
+            return list(map(tuple, np.asarray(fonction(points, **parametres)).reshape(-1, 2).tolist()))
+        sommets = self._lit(cle)
+        if sommets is None:
+            self.echecs += 1
+            sommets = np.asarray(fonction(points, **parametres)).reshape(-1, 2)
+            self._range(cle, sommets)
+            if self.dossier is not None:
+                self._ecrit(cle, sommets)
+        else:
+            self.succes += 1
+        return list(map(tuple, sommets.tolist()))
+
+    def cle(self, fonction, points, **parametres):
+        """
+        Cle d'une enveloppe: nom qualifie de l'algorithme, parametres tries, empreinte.
+        None pour une fonction anonyme ou locale, que son nom ne designe pas sans
+        ambiguite (elle n'est alors pas memoisee).
+        """
+        while isinstance(fonction, partial):
+            parametres = {**fonction.keywords, **parametres}
+            fonction = fonction.func
+        qualifie = getattr(fonction, "__qualname__", None)
+        if qualifie is None or "<" in qualifie:
+            return None
+        nom = f"{fonction.__module__}.{qualifie}"
+        reglages = ",".join(f"{k}={v!r}" for k, v in sorted(parametres.items()))
+        h = hashlib.blake2b(f"{nom}({reglages})".encode(), digest_size=16)
+        h.update(empreinte(points).encode())
+        return h.hexdigest()
+
+    def vider(self):
+        """Vide le niveau memoire (le dossier eventuel est conserve)."""
+        self._entrees.clear()
+        self.octets = 0
+
+    def _lit(self, cle):
+        sommets = self._entrees.get(cle)
+        if sommets is not None:
+            self._entrees.move_to_end(cle)
+            return sommets
+        if self.dossier is None:
+            return None
+        try:
+            sommets = np.load(self.dossier / f"{cle}.npy", allow_pickle=False)
+        except (OSError, ValueError, EOFError):
+            return None
+        self._range(cle, sommets)
+        return sommets
+
+    def _range(self, cle, sommets):
+        taille = sommets.nbytes + _SURCOUT
+        if taille > self.max_octets:
+            return
+        self._entrees[cle] = sommets
+        self.octets += taille
+        while self.octets > self.max_octets:
+            _, ancien = self._entrees.popitem(last=False)
+            self.octets -= ancien.nbytes + _SURCOUT
+
+    def _ecrit(self, cle, sommets):
+        # Ecriture atomique: un lecteur concurrent ne voit jamais de fichier partiel.
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        provisoire = self.dossier / f"{cle}.{os.getpid()}.tmp"
+        with open(provisoire, "wb") as f:
+            np.save(f, sommets, allow_pickle=False)
+        os.replace(provisoire, self.dossier / f"{cle}.npy")
+
+
+# Cache partage par main, plots et show_steps (niveau memoire seul par defaut).
+CACHE = CacheEnveloppes()
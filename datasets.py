@@ -0,0 +1,92 @@
+"""Jeux de points reproductibles (graine) et mis en cache au format .npy."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR = Path("data") / "cache"
+
+# Pas de la grille des coordonnees colineaires: 1/64 est exact en binaire, donc
+# les points generes sur une meme droite y restent exactement alignes.
+_PAS_GRILLE = 1 / 64
+
+
+def _uniforme(rng, n):
+    return rng.uniform(-10, 10, size=(n, 2))
+
+
+def _disque(rng, n):
+    rayon = 10 * np.sqrt(rng.random(n))
+    angle = rng.uniform(0, 2 * np.pi, n)
+    return np.column_stack((rayon * np.cos(angle), rayon * np.sin(angle)))
+
+
+def _cercle(rng, n):
+    # Tous les points sont sur le cercle: h = n (au plus pres de l'arrondi flottant).
+    angle = rng.uniform(0, 2 * np.pi, n)
+    return np.column_stack((10 * np.cos(angle), 10 * np.sin(angle)))
+
+
+def _gaussienne(rng, n):
+    return rng.normal(0, 3, size=(n, 2))
+
+
+def _amas(rng, n):
+    centres = rng.uniform(-10, 10, size=(8, 2))
+    return centres[rng.integers(0, len(centres), n)] + rng.normal(0, 0.5, size=(n, 2))
+
+
+def _colineaire(rng, n):
+    # Points sur les quatre cotes d'un carre et sur sa diagonale, a coordonnees exactes.
+    t = rng.integers(-640, 641, n) * _PAS_GRILLE
+    cote = rng.integers(0, 5, n)
+    x = np.select([cote == 0, cote == 1], [np.full(n, -10.0), np.full(n, 10.0)], t)
+    y = np.select([cote == 2, cote == 3], [np.full(n, -10.0), np.full(n, 10.0)], t)
+    return np.column_stack((x, y))
+
+
+def _doublons(rng, n):
+    # Environ vingt copies de chaque point distinct.
+    distincts = rng.uniform(-10, 10, size=(max(1, n // 20), 2))
+    return distincts[rng.integers(0, len(distincts), n)]
+
+
+_GENERATEURS = {
+    "uniforme": _uniforme,
+    "disque": _disque,
+    "cercle": _cercle,
+    "gaussienne": _gaussienne,
+    "amas": _amas,
+    "colineaire": _colineaire,
+    "doublons": _doublons,
+}
+DISTRIBUTIONS = tuple(_GENERATEURS)
+
+
+def generer(distribution, n, seed=0):
+    """Tire n points (tableau (n, 2) float64) selon la distribution, de facon reproductible."""
+    if distribution not in _GENERATEURS:
+        raise ValueError(f"distribution inconnue: {distribution!r} (choix: {', '.join(DISTRIBUTIONS)})")
+    rng = np.random.default_rng(seed)
+    return np.ascontiguousarray(_GENERATEURS[distribution](rng, n), dtype=np.float64)
+
+
+def charger(distribution, n, seed=0, cache=True):
+    """
+    Comme generer, mais relit le fichier .npy de CACHE_DIR s'il existe.
+
+    Le tableau renvoye est projete en memoire (lecture seule): les executions
+    suivantes de main.py ne regenerent ni ne recopient les points.
+    """
+    if not cache:
+        return generer(distribution, n, seed)
+    chemin = CACHE_DIR / f"{distribution}_{n}_{seed}.npy"
+    if not chemin.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Ecriture sous un nom propre au processus puis renommage atomique: des
+        # processus paralleles (bench.executer_grille) ne lisent jamais un fichier partiel.
+        provisoire = chemin.with_suffix(f".{os.getpid()}.npy")
+        np.save(provisoire, generer(distribution, n, seed))
+        os.replace(provisoire, chemin)
+    return np.load(chemin, mmap_mode="r")
@@ -5,63 +5,308 @@ Etapes clefs de l'experience:
 2. Associer chaque taille aux differentes implementations d'enveloppe convexe.
 3. Chronometrer chaque algorithme sur les nuages generes et collecter les stats.
 4. Tracer les courbes de performances puis visualiser les enveloppes resultantes.
+
+Usage: python main.py [--algos ...] [--tailles ...] [--distributions ...] [--repeat N]
+[--format texte|json|jsonl|csv] [--sans-graphiques] ... (python main.py --help).
+matplotlib n'est importe que si des graphiques sont demandes.
 """
 
+import time
+
+# Origine du temps de demarrage: avant toutes les autres importations.
+_DEBUT = time.perf_counter()
+
+import argparse
+import random as rd
+import sys
+from collections import deque
 from functools import partial
+from pathlib import Path
 
-from utils import nuage, benchmark
+import numpy as np
+
+from bench import RESULTS_DIR, demarrage_a_froid, ecrire_flux, executer_grille, metadonnees
+from cache_enveloppes import CACHE
+from datasets import DISTRIBUTIONS
+from utils import aires_signees, area_signed, nuage, benchmark
 from algorithms import (
     enveloppe_monotone,
+    enveloppes_monotone_groupees,
     enveloppe_quickhull,
     enveloppe_graham,
     merge_hull as merge_enveloppe,
     preparata_hong,
+    enveloppe_chan,
+    enveloppe_kirkpatrick_seidel,
+    filtre_akl_toussaint,
+    SlidingWindowHull,
+    PointSet,
 )
-from plots.compare import plot_temps, plot_hulls as plot_enveloppes, plot_merge_thresholds
-
-
-def main():
-    
-    tailles = [10 + i*200 for i in range(100)]  
-    algos = [
-        ("Monotone Chain", enveloppe_monotone),
-        ("QuickHull", enveloppe_quickhull),
-        ("Graham Scan", enveloppe_graham),
-        ("Merge enveloppe", merge_enveloppe),
-        ("Preparata-Hong", preparata_hong)
+from algorithms.calipers import diametre, largeur, rectangle_minimal, mesures_lot
+
+SEED = 2024
+# Mode entier: pas de grille 1/64, celui des nuages "colineaire" (donc sans perte).
+ECHELLE = 64
+ALGORITHMES = {
+    "monotone": ("Monotone Chain", enveloppe_monotone),
+    "quickhull": ("QuickHull", enveloppe_quickhull),
+    "graham": ("Graham Scan", enveloppe_graham),
+    "merge": ("Merge enveloppe", merge_enveloppe),
+    "preparata-hong": ("Preparata-Hong", preparata_hong),
+    "chan": ("Chan", enveloppe_chan),
+    "kirkpatrick-seidel": ("Kirkpatrick-Seidel", enveloppe_kirkpatrick_seidel),
+}
+TAILLES = [10 + i * 200 for i in range(100)]
+SEUILS = list(range(1, 101, 2))
+# Parties de l'experience en dehors de la campagne principale.
+SECTIONS = ("entier", "filtre", "pointset", "fenetre", "calipers", "groupes", "validation")
+
+
+def flux_fenetre(points, taille=500):
+    """Rejoue un flux de points en maintenant l'enveloppe de la fenetre glissante."""
+    fenetre = SlidingWindowHull(max_count=taille)
+    enveloppe = []
+    for p in points:
+        fenetre.add(p)
+        enveloppe = fenetre.vertices
+    return enveloppe
+
+
+def flux_recalcul(points, taille=500):
+    """Reference: recalcule Monotone Chain sur toute la fenetre a chaque point."""
+    fenetre = deque(maxlen=taille)
+    enveloppe = []
+    for p in points:
+        fenetre.append(p)
+        enveloppe = enveloppe_monotone(fenetre)
+    return enveloppe
+
+
+def mesures_calipers(enveloppe):
+    """Diametre, largeur et rectangle minimal d'une enveloppe (pied a coulisse)."""
+    return [diametre(enveloppe), largeur(enveloppe), rectangle_minimal(enveloppe)]
+
+
+def groupes_boucle(points, decalages):
+    """Reference: un appel a enveloppe_monotone puis area_signed par groupe."""
+    enveloppes = [enveloppe_monotone(points[d:f]) for d, f in zip(decalages[:-1], decalages[1:])]
+    return enveloppes, [area_signed(e) for e in enveloppes]
+
+
+def groupes_lot(points, decalages):
+    """Toutes les enveloppes et leurs aires en un appel (stockage CSR)."""
+    sommets, decalages_sommets = enveloppes_monotone_groupees(points, decalages)
+    return sommets, aires_signees(sommets, decalages_sommets)
+
+
+def tous_les_algos(points, algos):
+    """Applique chaque algorithme au meme nuage (liste de points ou PointSet)."""
+    return [f(points) for _, f in algos]
+
+
+def analyse_arguments(argv=None):
+    """Options de la ligne de commande (argv: liste d'arguments, defaut sys.argv)."""
+    parser = argparse.ArgumentParser(description="Compare les algorithmes d'enveloppe convexe.")
+    parser.add_argument("--algos", nargs="+", choices=list(ALGORITHMES), default=list(ALGORITHMES),
+                        help="algorithmes a mesurer (defaut: tous)")
+    parser.add_argument("--tailles", nargs="*", type=int, default=TAILLES,
+                        help="tailles du balayage sur nuages uniformes (defaut: 10 a 19810 par pas de 200)")
+    parser.add_argument("--distributions", nargs="*", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS),
+                        help="distributions mesurees a taille fixe (defaut: toutes)")
+    parser.add_argument("--n", type=int, default=20000, help="taille des nuages par distribution")
+    parser.add_argument("--seuils", nargs="*", type=int, default=SEUILS,
+                        help="seuils de Merge Hull a balayer sur 6000 points (vide: aucun)")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions chronometrees par cellule")
+    parser.add_argument("--workers", type=int, default=None, help="processus de la campagne (1: en serie)")
+    parser.add_argument("--sections", nargs="*", choices=SECTIONS, default=list(SECTIONS),
+                        help="parties annexes a executer (defaut: toutes)")
+    parser.add_argument("--format", choices=("texte", "json", "jsonl", "csv"), default="texte",
+                        help="sortie standard: tableaux lisibles, ou mesures brutes (texte alors sur stderr)")
+    parser.add_argument("--sortie", default=str(RESULTS_DIR / "campagne.jsonl"),
+                        help="fichier JSONL de la campagne, ecrit au fil de l'eau")
+    parser.add_argument("--reprendre", action="store_true", help="saute les cellules deja dans --sortie")
+    parser.add_argument("--sans-memoire", action="store_true", help="pas de passe tracemalloc")
+    parser.add_argument("--sans-graphiques", action="store_true", help="n'importe pas matplotlib")
+    parser.add_argument("--demarrage", type=int, default=0, metavar="N",
+                        help="mesure aussi le demarrage a froid (N interpretes neufs, avec et sans graphiques)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    # Imports de main (algorithmes, numpy, bench) termines: cout du demarrage du script.
+    demarrage_ms = (time.perf_counter() - _DEBUT) * 1000
+    args = analyse_arguments(argv)
+    # En sortie brute, les tableaux lisibles passent sur stderr pour ne pas la polluer.
+    flux = sys.stdout if args.format == "texte" else sys.stderr
+
+    def afficher(*morceaux):
+        print(*morceaux, file=flux)
+
+    rd.seed(SEED)
+    tailles = args.tailles
+    distributions = args.distributions
+    n_dist = args.n
+    algos = [ALGORITHMES[cle] for cle in args.algos]
+    seuils = args.seuils if "merge" in args.algos else []
+    degeneres = [d for d in ("doublons", "colineaire") if d in distributions] if "entier" in args.sections else []
+
+    afficher("=== COMPARAISON DES ALGORITHMES D'ENVELOPPE CONVEXE ===")
+    afficher(f"Demarrage (imports, sans matplotlib) | {demarrage_ms:9.2f} ms")
+    # Chaque cellule (algorithme, taille, distribution, parametres) est independante:
+    # elles sont reparties sur un pool de processus et leur nuage est regenere a
+    # partir de la graine (un nouveau nuage par taille afin de limiter les biais).
+    cellules = [
+        {"algo": nom, "n": n, "distribution": "uniforme", "seed": SEED + n, "fonction": f}
+        for n in tailles for nom, f in algos
     ]
+    # Distributions variees a taille fixe: h (nombre de sommets) change fortement.
+    cellules += [
+        {"algo": nom, "n": n_dist, "distribution": d, "seed": SEED, "fonction": f}
+        for d in distributions for nom, f in algos
+    ]
+    # Analyse specifique de Merge enveloppe: impact du seuil de division sur un nuage fixe.
+    cellules += [
+        {"algo": "Merge enveloppe", "n": 6000, "distribution": "uniforme",
+         "parametres": f"seuil={seuil}", "seed": SEED, "fonction": partial(merge_enveloppe, seuil=seuil)}
+        for seuil in seuils
+    ]
+    # Mode entier (coordonnees quantifiees) sur les nuages degeneres, face aux flottants.
+    cellules += [
+        {"algo": nom, "n": n_dist, "distribution": d, "parametres": f"echelle={ECHELLE}",
+         "seed": SEED, "fonction": partial(f, echelle=ECHELLE)}
+        for d in degeneres for nom, f in algos
+    ]
+
+    # Les mesures sont ecrites au fil de l'eau (python bench.py compare ... pour comparer
+    # deux executions); avec reprendre, les cellules deja mesurees sont sautees.
+    chemin = Path(args.sortie)
+    if not args.reprendre:
+        chemin.unlink(missing_ok=True)
+    meta = {**metadonnees(SEED), "demarrage_ms": round(demarrage_ms, 2)}
+    # Le profil memoire (tracemalloc) est pris dans une passe separee du chronometrage.
+    lignes = executer_grille(cellules, chemin, workers=args.workers, repeat=args.repeat,
+                             meta=meta, memoire=not args.sans_memoire)
+    afficher(f"Resultats enregistres dans {chemin}")
+    par_cle = {(ligne["algo"], ligne["n"], ligne["distribution"], ligne.get("parametres", "")): ligne for ligne in lignes}
+
+    if distributions:
+        afficher(f"\n=== DISTRIBUTIONS (n={n_dist}) ===")
+    for distribution in distributions:
+        for nom, _ in algos:
+            ligne = par_cle[nom, n_dist, distribution, ""]
+            memoire = "" if args.sans_memoire else (f" | pic {ligne['pic_memoire_ko']:8.1f} Ko"
+                                                    f" | {ligne['blocs']:5d} blocs")
+            afficher(f"{distribution:<11} | {nom:<20} | h={ligne['sommets']:5d} | {ligne['mediane_ms']:9.2f} ms"
+                     + memoire)
 
-    print("=== COMPARAISON DES ALGORITHMES D'ENVELOPPE CONVEXE ===")
-    # Stocke les temps median calcules pour chaque algorithme (par taille).
-    temps = {nom: [] for nom, _ in algos}
+    if degeneres:
+        afficher(f"\n=== MODE ENTIER (echelle={ECHELLE}, n={n_dist}) ===")
+    for distribution in degeneres:
+        for nom, _ in algos:
+            flottant = par_cle[nom, n_dist, distribution, ""]
+            entier = par_cle[nom, n_dist, distribution, f"echelle={ECHELLE}"]
+            afficher(f"{distribution:<11} | {nom:<20} | flottants {flottant['mediane_ms']:9.2f} ms"
+                     f" (h={flottant['sommets']:3d}) | entiers {entier['mediane_ms']:9.2f} ms (h={entier['sommets']:3d})")
 
-    for n in tailles:
-        # Genere un nouveau nuage pour chaque taille afin de limiter les biais.
-        E = nuage(n)
-        #print(f"\n--- {n} points ---")
+    if "filtre" in args.sections:
+        # Pre-filtre Akl-Toussaint: nombre de points elimines et gain sur un nuage fixe.
+        E_filtre = nuage(20000)
+        _, supprimes = filtre_akl_toussaint(E_filtre)
+        afficher(f"\n=== PRE-FILTRE AKL-TOUSSAINT ({supprimes}/{len(E_filtre)} points elimines) ===")
         for nom, f in algos:
-            tps, nsom = benchmark(f, E)
-            temps[nom].append(tps)
-            #print(f"{nom:<20} | {nsom:3d} sommets | {tps:7.2f} ms")
-
-    plot_temps(tailles, temps, algos)
-    
-    #Analyse specifique de Merge enveloppe: impact du seuil de division sur un nuage fixe.
-    seuils = [i for i in range(1, 101, 2)]
-    E_merge = nuage(6000)
-    temps_merge = []
-    print("\n=== IMPACT DU SEUIL SUR MERGE enveloppe (nuage fixe) ===")
-    for seuil in seuils:
-        f_merge = partial(merge_enveloppe, seuil=seuil)
-        tps, nsom = benchmark(f_merge, E_merge)
-        temps_merge.append(tps)
-        #print(f"seuil={seuil:<3d} | sommets={nsom:3d} | temps={tps:7.2f} ms")
-    plot_merge_thresholds(seuils, temps_merge, len(E_merge))
-
-    # Visualisation finale: toutes les enveloppes d'un meme nuage pour comparer.
+            tps, _ = benchmark(f, E_filtre, repeat=args.repeat)
+            tps_filtre, _ = benchmark(partial(f, prefilter=True), E_filtre, repeat=args.repeat)
+            afficher(f"{nom:<20} | sans filtre {tps:8.2f} ms | avec filtre {tps_filtre:8.2f} ms")
+
+    if "pointset" in args.sections:
+        # PointSet: nuage compact trie une seule fois puis partage par tous les algorithmes.
+        E_partage = nuage(20000)
+        tps_liste, _ = benchmark(partial(tous_les_algos, algos=algos), E_partage, repeat=3)
+        tps_pointset, _ = benchmark(lambda pts: tous_les_algos(PointSet(pts), algos), E_partage, repeat=3)
+        afficher(f"\n=== POINTSET PARTAGE (n=20000, {len(algos)} algorithmes) ===")
+        afficher(f"Listes de points     | {tps_liste:9.2f} ms")
+        afficher(f"PointSet partage     | {tps_pointset:9.2f} ms")
+
+    if "fenetre" in args.sections:
+        # Fenetre glissante: structure a deux piles contre recalcul complet a chaque tick.
+        flux_points = nuage(5000)
+        afficher("\n=== FENETRE GLISSANTE (W=500, 5000 ticks) ===")
+        for nom, f in (("SlidingWindowHull", flux_fenetre), ("Recalcul monotone", flux_recalcul)):
+            tps, nsom = benchmark(f, flux_points, repeat=3)
+            afficher(f"{nom:<20} | {nsom:3d} sommets | {tps:9.2f} ms")
+
+    if "calipers" in args.sections:
+        # Pied a coulisse: cout des mesures O(h) compare au calcul de l'enveloppe.
+        E_mesure = nuage(20000)
+        afficher("\n=== PIED A COULISSE (n=20000) ===")
+        tps_env, _ = benchmark(enveloppe_monotone, E_mesure, repeat=args.repeat)
+        enveloppe = CACHE.calcule(enveloppe_monotone, E_mesure)
+        tps_mes, _ = benchmark(mesures_calipers, enveloppe, repeat=args.repeat)
+        lot = [enveloppe_monotone(nuage(200)) for _ in range(1000)]
+        tps_boucle, _ = benchmark(lambda enveloppes: [mesures_calipers(e) for e in enveloppes], lot,
+                                  repeat=args.repeat)
+        tps_lot, _ = benchmark(mesures_lot, lot, repeat=args.repeat)
+        afficher(f"Enveloppe monotone   | {tps_env:9.2f} ms")
+        afficher(f"Mesures (h={len(enveloppe):3d})      | {tps_mes:9.2f} ms")
+        afficher(f"1000 enveloppes      | boucle {tps_boucle:9.2f} ms | lot vectorise {tps_lot:9.2f} ms")
+
+    if "groupes" in args.sections:
+        # Nombreux petits amas: un appel par groupe contre un seul appel groupe (CSR).
+        tailles_groupes = [rd.randint(10, 500) for _ in range(2000)]
+        decalages = np.concatenate(([0], np.cumsum(tailles_groupes)))
+        E_groupes = np.array(nuage(int(decalages[-1])))
+        liste_groupes = E_groupes.tolist()
+        tps_boucle, _ = benchmark(partial(groupes_boucle, decalages=decalages), liste_groupes, repeat=args.repeat)
+        tps_lot, _ = benchmark(partial(groupes_lot, decalages=decalages), E_groupes, repeat=args.repeat)
+        afficher(f"\n=== ENVELOPPES GROUPEES ({len(tailles_groupes)} groupes de 10 a 500 points, "
+                 f"n={len(E_groupes)}) ===")
+        afficher(f"Boucle par groupe    | {tps_boucle:9.2f} ms")
+        afficher(f"Appel groupe (CSR)   | {tps_lot:9.2f} ms")
+
     E = nuage(800)
-    plot_enveloppes(E, algos)
+    if "validation" in args.sections:
+        # Validation: tous les algorithmes doivent trouver les memes sommets. Les
+        # enveloppes sont memorisees et resservent a la visualisation finale.
+        reference = set(CACHE.calcule(enveloppe_monotone, E))
+        ecarts = [nom for nom, f in algos if set(CACHE.calcule(f, E)) != reference]
+        afficher(f"\n=== VALIDATION (n={len(E)}) ===")
+        afficher(f"Enveloppes differentes: {', '.join(ecarts)}" if ecarts else "Enveloppes identiques")
+
+    if not args.sans_graphiques:
+        # matplotlib n'est charge qu'ici: les executions sans graphiques ne le paient pas.
+        debut = time.perf_counter()
+        from plots.compare import plot_hulls as plot_enveloppes, plot_memoire, plot_merge_thresholds, plot_temps
+        afficher(f"\nImport des graphiques (matplotlib) | {(time.perf_counter() - debut) * 1000:9.2f} ms")
+
+        # Temps medians (et pics memoire) de chaque algorithme, par taille.
+        if tailles:
+            temps = {nom: [par_cle[nom, n, "uniforme", ""]["mediane_ms"] for n in tailles] for nom, _ in algos}
+            plot_temps(tailles, temps, algos)
+            if not args.sans_memoire:
+                memoire = {nom: [par_cle[nom, n, "uniforme", ""]["pic_memoire_ko"] for n in tailles]
+                           for nom, _ in algos}
+                plot_memoire(tailles, memoire, algos)
+        # Impact du seuil sur Merge enveloppe, mesure dans la campagne ci-dessus.
+        if seuils:
+            temps_merge = [
+                par_cle["Merge enveloppe", 6000, "uniforme", f"seuil={seuil}"]["mediane_ms"] for seuil in seuils
+            ]
+            plot_merge_thresholds(seuils, temps_merge, 6000)
+        # Visualisation finale: toutes les enveloppes d'un meme nuage pour comparer.
+        plot_enveloppes(E, algos)
+    afficher(CACHE)
+
+    if args.demarrage:
+        # Interpretes neufs: demarrage complet de Python compris.
+        afficher(f"\n=== DEMARRAGE A FROID (min sur {args.demarrage} interpretes) ===")
+        afficher(f"import main                | {demarrage_a_froid('import main', args.demarrage):9.2f} ms")
+        afficher(f"import main, plots.compare | "
+                 f"{demarrage_a_froid('import main, plots.compare', args.demarrage):9.2f} ms")
+
+    if args.format != "texte":
+        ecrire_flux(sys.stdout, lignes, meta, args.format)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -6,8 +6,17 @@ from pathlib import Path
 
 import matplotlib.pyplot as plt
 
+from algorithms.pointset import PointSet
+from bench import lire_resultats
+from cache_enveloppes import CACHE
+
 OUTPUT_DIR = Path("plots") / "output"
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _fichier(nom):
+    """Chemin d'une figure; le dossier n'est cree qu'a la premiere sauvegarde."""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    return OUTPUT_DIR / nom
 
 
 def _slugify(name):
@@ -30,7 +39,7 @@ def plot_temps(tailles, temps, algos):
     ax.set_ylabel("Temps (ms)")
     ax.grid(True, which="both", linestyle="--", alpha=0.5)
     ax.legend()
-    output = OUTPUT_DIR / "comparaison_temps.png"
+    output = _fichier("comparaison_temps.png")
     fig.tight_layout()
     fig.savefig(output, dpi=150)
     plt.close(fig)
@@ -45,14 +54,47 @@ def plot_temps(tailles, temps, algos):
         ax.set_xscale("linear")
         ax.set_yscale("linear")
         ax.grid(True, linestyle="--", alpha=0.5)
-        output = OUTPUT_DIR / f"temps_{_slugify(nom)}.png"
+        output = _fichier(f"temps_{_slugify(nom)}.png")
         fig.tight_layout()
         fig.savefig(output, dpi=150)
         plt.close(fig)
 
 
-def plot_hulls(points, algos):
-    """Trace un nuage par algorithme afin de comparer visuellement chaque enveloppe."""
+def plot_memoire(tailles, memoire, algos):
+    """Trace le pic memoire (Ko, tracemalloc) de chaque algorithme en fonction de n."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    for nom, _ in algos:
+        ax.plot(tailles, memoire[nom], marker="o", label=nom)
+    ax.set_title("Pic memoire par appel")
+    ax.set_xlabel("Nombre de points")
+    ax.set_ylabel("Pic memoire (Ko)")
+    ax.grid(True, which="both", linestyle="--", alpha=0.5)
+    ax.legend()
+    output = _fichier("comparaison_memoire.png")
+    fig.tight_layout()
+    fig.savefig(output, dpi=150)
+    plt.close(fig)
+
+
+def plot_temps_fichier(chemin, distribution="uniforme"):
+    """Trace les courbes de plot_temps a partir d'un fichier de resultats persiste."""
+    _, lignes = lire_resultats(chemin)
+    lignes = [
+        ligne for ligne in lignes
+        if ligne.get("distribution", distribution) == distribution and not ligne.get("parametres")
+    ]
+    noms = list(dict.fromkeys(ligne["algo"] for ligne in lignes))
+    tailles = sorted({ligne["n"] for ligne in lignes})
+    par_cle = {(ligne["algo"], ligne["n"]): ligne["mediane_ms"] for ligne in lignes}
+    temps = {nom: [par_cle.get((nom, n), math.nan) for n in tailles] for nom in noms}
+    plot_temps(tailles, temps, [(nom, None) for nom in noms])
+
+
+def plot_hulls(points, algos, cache=CACHE):
+    """
+    Trace un nuage par algorithme afin de comparer visuellement chaque enveloppe.
+    Les enveloppes passent par cache: celles deja calculees sur ce nuage resservent.
+    """
     n = len(algos)
     if n == 0:
         return
@@ -62,16 +104,18 @@ def plot_hulls(points, algos):
     fig, axes = plt.subplots(nrows, ncols, figsize=(4.5 * ncols, 4.5 * nrows))
     axes = [ax for ax in axes.flat] if hasattr(axes, "flat") else [axes]
 
-    x, y = zip(*points)
-    xmin, xmax = min(x), max(x)
-    ymin, ymax = min(y), max(y)
+    # Un seul PointSet pour tous les algorithmes: le tri du nuage n'est paye qu'une fois.
+    points = PointSet(points)
+    x, y = points.x, points.y
+    xmin, xmax = float(x.min()), float(x.max())
+    ymin, ymax = float(y.min()), float(y.max())
     span = max(xmax - xmin, ymax - ymin)
     padding = 0.05 * span if span else 1.0
 
     for idx, (nom, f) in enumerate(algos):
         ax = axes[idx]
         ax.scatter(x, y, s=8, color="gray", alpha=0.4)
-        hull = f(points)
+        hull = cache.calcule(f, points)
         if hull:
             hx, hy = zip(*(hull + [hull[0]]))
             ax.plot(hx, hy, color="tab:blue")
@@ -86,7 +130,7 @@ def plot_hulls(points, algos):
 
     fig.suptitle("Comparaison des enveloppes convexes")
     fig.tight_layout(rect=(0, 0, 1, 0.96))
-    output = OUTPUT_DIR / "comparaison_enveloppes.png"
+    output = _fichier("comparaison_enveloppes.png")
     fig.savefig(output, dpi=150)
     plt.close(fig)
 
@@ -99,7 +143,7 @@ def plot_merge_thresholds(seuils, temps, n_points):
     ax.set_xlabel("Seuil (taille maximale du sous-probleme)")
     ax.set_ylabel("Temps median (ms)")
     ax.grid(True, linestyle="--", alpha=0.5)
-    output = OUTPUT_DIR / "merge_hull_seuils.png"
+    output = _fichier("merge_hull_seuils.png")
     fig.tight_layout()
     fig.savefig(output, dpi=150)
     plt.close(fig)
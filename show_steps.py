@@ -1,19 +1,27 @@
 """Visualisation iterative des etapes des enveloppes convexes."""
 
+import itertools
 import math
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 
-from algorithms import enveloppe_monotone, enveloppe_quickhull
-from utils import area_signed, cross, nuage
+from algorithms import enveloppe_monotone
+from algorithms.graham import ordre_angulaire
+from algorithms.predicats import orient
+from cache_enveloppes import CACHE
+from traces import Enregistreur, Rejoueur, Trace
+from utils import nuage
 
 Point = Tuple[float, float]
 Step = dict
 
 STEPS_DIR = Path("plots") / "steps"
-STEPS_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _unique(points: Sequence[Sequence[float]]) -> List[Point]:
@@ -33,277 +41,372 @@ def _close_coords(poly: Sequence[Point], close: bool) -> Tuple[List[float], List
     return xs, ys
 
 
-def _partial_monotone(lower: Sequence[Point], upper: Sequence[Point]) -> List[Point]:
-    """Assemble les chaines courantes de l'algorithme monotone."""
-    chain = list(lower)
-    if upper:
-        rev = list(reversed(upper))
-        if chain:
-            chain += rev[:-1]  # Ajoute la chaine haute sans repeter l'extremite droite.
-        else:
-            chain = rev
-    return chain
-
-
-def monotone_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+def monotone_trace(points: Sequence[Sequence[float]]) -> Trace:
+    """
+    Chaine affichee: la chaine basse puis la chaine haute en cours, depuis
+    l'extremite droite; chaque push/pop est un evenement.
+    """
     pts = _unique(points)
+    journal = Enregistreur(pts)
     if len(pts) <= 1:
-        yield {"hull": pts, "active": None, "label": "Cas trivial", "close": False}
-        return
-
-    lower: List[Point] = []
-    upper: List[Point] = []
-    yield {"hull": [], "active": None, "label": "Tri des points", "close": False}
-
-    for p in pts:
-        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
-            removed = lower.pop()
-            yield {
-                "hull": _partial_monotone(lower, upper),
-                "active": removed,
-                "label": f"Lower pop {removed}",
-                "close": False,
-            }
-        lower.append(p)
-        yield {
-            "hull": _partial_monotone(lower, upper),
-            "active": p,
-            "label": f"Lower push {p}",
-            "close": False,
-        }
-
-    for p in reversed(pts):
-        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
-            removed = upper.pop()
-            yield {
-                "hull": _partial_monotone(lower, upper),
-                "active": removed,
-                "label": f"Upper pop {removed}",
-                "close": True,
-            }
-        upper.append(p)
-        yield {
-            "hull": _partial_monotone(lower, upper),
-            "active": p,
-            "label": f"Upper push {p}",
-            "close": True,
-        }
+        journal.remplace(range(len(pts)), "Cas trivial")
+        return journal.trace()
+
+    lower: List[int] = []
+    upper: List[int] = []
+    journal.note("Tri des points")
+
+    for k, p in enumerate(pts):
+        while len(lower) >= 2 and orient(pts[lower[-2]], pts[lower[-1]], p) <= 0:
+            journal.pop(lower.pop(), "Lower pop {p}")
+        lower.append(k)
+        journal.push(k, "Lower push {p}")
+
+    for k in reversed(range(len(pts))):
+        p = pts[k]
+        while len(upper) >= 2 and orient(pts[upper[-2]], pts[upper[-1]], p) <= 0:
+            journal.pop(upper.pop(), "Upper pop {p}", ferme=True)
+        upper.append(k)
+        if len(upper) == 1:
+            # Extremite droite: deja en fin de chaine basse.
+            journal.note("Upper push {p}", k, ferme=True)
+        else:
+            journal.push(k, "Upper push {p}", ferme=True)
 
+    # Virages a gauche exacts (orient): l'enveloppe est deja en sens anti-horaire.
     hull = lower[:-1] + upper[:-1]
-    if area_signed(hull) < 0:
-        hull.reverse()
-    yield {"hull": hull, "active": None, "label": "Enveloppe complete", "close": True}
+    journal.remplace(hull, "Enveloppe complete", ferme=True)
+    return journal.trace()
 
 
-def graham_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+def graham_trace(points: Sequence[Sequence[float]]) -> Trace:
     pts = _unique(points)
+    journal = Enregistreur(pts)
     if len(pts) <= 2:
-        yield {"hull": pts, "active": None, "label": "Moins de 3 points", "close": False}
-        return
-
-    pivot = min(pts, key=lambda p: (p[1], p[0]))
-    sorted_pts = sorted(
-        [p for p in pts if p != pivot],
-        key=lambda p: math.atan2(p[1] - pivot[1], p[0] - pivot[0]),
-    )
+        journal.remplace(range(len(pts)), "Moins de 3 points")
+        return journal.trace()
+
+    # Meme ordre que enveloppe_graham: pseudo-angle autour du minimum lexicographique.
+    rangs = {p: k for k, p in enumerate(pts)}
+    pivot, sorted_pts = ordre_angulaire(pts)
     if not sorted_pts:
-        yield {"hull": [pivot], "active": None, "label": "Points colineaires", "close": False}
-        return
+        journal.remplace([rangs[pivot]], "Points colineaires")
+        return journal.trace()
 
     stack: List[Point] = [pivot, sorted_pts[0]]
-    yield {"hull": stack.copy(), "active": sorted_pts[0], "label": "Initialisation", "close": False}
+    journal.push(rangs[pivot], image=False)
+    journal.push(rangs[sorted_pts[0]], "Initialisation")
 
     for p in sorted_pts[1:]:
-        while len(stack) >= 2 and cross(stack[-2], stack[-1], p) <= 0:
-            removed = stack.pop()
-            yield {
-                "hull": stack.copy(),
-                "active": removed,
-                "label": f"Pop {removed}",
-                "close": False,
-            }
+        while len(stack) >= 2 and orient(stack[-2], stack[-1], p) <= 0:
+            journal.pop(rangs[stack.pop()], "Pop {p}")
         stack.append(p)
-        yield {
-            "hull": stack.copy(),
-            "active": p,
-            "label": f"Push {p}",
-            "close": False,
-        }
+        journal.push(rangs[p], "Push {p}")
 
-    hull = stack.copy()
-    yield {"hull": hull, "active": None, "label": "Enveloppe complete", "close": True}
+    journal.note("Enveloppe complete", ferme=True)
+    return journal.trace()
 
 
-def quickhull_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+def quickhull_trace(points: Sequence[Sequence[float]]) -> Trace:
+    """
+    Chaine affichee: les points retenus, dans l'ordre anti-horaire depuis A. Chaque
+    point le plus eloigne est insere entre les extremites de son segment.
+    """
     pts = _unique(points)
+    journal = Enregistreur(pts)
     if len(pts) <= 2:
-        yield {"hull": pts, "active": None, "label": "Moins de 3 points", "close": False}
-        return
+        journal.remplace(range(len(pts)), "Moins de 3 points")
+        return journal.trace()
 
     def det(A: Point, B: Point, C: Point) -> float:
         return (A[0] - B[0]) * (C[1] - B[1]) - (A[1] - B[1]) * (C[0] - B[0])
 
-    def farthest(A: Point, B: Point, subset: Iterable[Point]) -> Optional[Point]:
+    def farthest(A: Point, B: Point, subset: Iterable[int]) -> Optional[int]:
         best, dmax = None, 0.0
-        for p in subset:
-            d = abs(det(A, B, p))
+        for k in subset:
+            d = abs(det(A, B, pts[k]))
             if d > dmax:
-                best, dmax = p, d
+                best, dmax = k, d
         return best
 
-    A = min(pts, key=lambda p: (p[0], p[1]))
-    B = max(pts, key=lambda p: (p[0], p[1]))
-    selected = {A, B}
-    yield {
-        "hull": list(selected),
-        "active": None,
-        "label": f"Points extremes {A} et {B}",
-        "close": False,
-    }
-
-    def recurse(P: Point, Q: Point, subset: List[Point]) -> Iterator[Step]:
-        if not subset:
-            yield {
-                "hull": enveloppe_monotone(list(selected)),
-                "active": None,
-                "label": f"Aucun point a gauche de {P}->{Q}",
-                "close": True,
-            }
-            return
-        pmax = farthest(P, Q, subset)
-        if pmax is None:
-            yield {
-                "hull": enveloppe_monotone(list(selected)),
-                "active": None,
-                "label": f"Aucun point a gauche de {P}->{Q}",
-                "close": True,
-            }
+    a = min(range(len(pts)), key=lambda k: pts[k])
+    b = max(range(len(pts)), key=lambda k: pts[k])
+    A, B = pts[a], pts[b]
+    ordre = [a, b]  # Copie locale de la chaine, pour trouver les rangs d'insertion.
+    journal.push(a, image=False)
+    journal.push(b, image=False)
+    journal.note(f"Points extremes {A} et {B}")
+
+    def recurse(P: int, Q: int, subset: List[int]) -> None:
+        kmax = farthest(pts[P], pts[Q], subset)
+        if kmax is None:
+            journal.note(f"Aucun point a gauche de {pts[P]}->{pts[Q]}", ferme=True)
             return
-        selected.add(pmax)
-        yield {
-            "hull": enveloppe_monotone(list(selected)),
-            "active": pmax,
-            "label": f"Point le plus eloigne {pmax}",
-            "close": True,
-        }
-        left1 = [p for p in subset if det(P, pmax, p) > 0]
-        left2 = [p for p in subset if det(pmax, Q, p) > 0]
-        yield from recurse(P, pmax, left1)
-        yield from recurse(pmax, Q, left2)
-
-    left = [p for p in pts if det(A, B, p) > 0]
-    right = [p for p in pts if det(A, B, p) < 0]
-    yield from recurse(A, B, left)
-    yield from recurse(B, A, right)
-
-    hull = enveloppe_quickhull(pts)
-    yield {"hull": hull, "active": None, "label": "Enveloppe complete", "close": True}
-
-
-def merge_steps(points: Sequence[Sequence[float]], seuil: int) -> Iterator[Step]:
+        position = ordre.index(P) + 1
+        ordre.insert(position, kmax)
+        journal.insere(position, kmax, "Point le plus eloigne {p}", ferme=True)
+        pmax = pts[kmax]
+        left1 = [k for k in subset if det(pts[P], pmax, pts[k]) > 0]
+        left2 = [k for k in subset if det(pmax, pts[Q], pts[k]) > 0]
+        recurse(P, kmax, left1)
+        recurse(kmax, Q, left2)
+
+    recurse(a, b, [k for k in range(len(pts)) if det(A, B, pts[k]) > 0])
+    recurse(b, a, [k for k in range(len(pts)) if det(A, B, pts[k]) < 0])
+
+    journal.note("Enveloppe complete", ferme=True)
+    return journal.trace()
+
+
+def merge_trace(points: Sequence[Sequence[float]], seuil: int) -> Trace:
+    """
+    Chaque cas de base et chaque fusion remplace la chaine affichee. Les coques
+    passent par le cache: Merge Hull et Preparata-Hong coupent aux memes milieux
+    et partagent leurs noeuds de plus de 64 points.
+    """
     pts = _unique(points)
+    journal = Enregistreur(pts)
+    rangs = {p: k for k, p in enumerate(pts)}
 
-    def recurse(subset: List[Point], depth: int) -> Iterator[Step]:
+    def recurse(subset: List[Point], depth: int) -> List[Point]:
         if len(subset) <= seuil:
-            hull = enveloppe_monotone(subset)
-            yield {
-                "hull": hull,
-                "active": None,
-                "label": f"Monotone (taille {len(subset)})",
-                "close": True,
-            }
+            hull = CACHE.calcule(enveloppe_monotone, subset)
+            journal.remplace([rangs[p] for p in hull], f"Monotone (taille {len(subset)})", ferme=True)
             return hull
 
         mid = len(subset) // 2
-        left = subset[:mid]
-        right = subset[mid:]
-        hull_left = yield from recurse(left, depth + 1)
-        hull_right = yield from recurse(right, depth + 1)
-        merged = enveloppe_monotone(hull_left + hull_right)
-        yield {
-            "hull": merged,
-            "active": None,
-            "label": f"Fusion niveau {depth}",
-            "close": True,
-        }
+        hull_left = recurse(subset[:mid], depth + 1)
+        hull_right = recurse(subset[mid:], depth + 1)
+        merged = CACHE.calcule(enveloppe_monotone, hull_left + hull_right)
+        journal.remplace([rangs[p] for p in merged], f"Fusion niveau {depth}", ferme=True)
         return merged
 
-    yield {"hull": [], "active": None, "label": "Tri et division rec", "close": False}
-    final = yield from recurse(pts, 0)
-    yield {"hull": final, "active": None, "label": "Enveloppe complete", "close": True}
+    journal.note("Tri et division rec")
+    final = recurse(pts, 0)
+    journal.remplace([rangs[p] for p in final], "Enveloppe complete", ferme=True)
+    return journal.trace()
 
 
-def merge_hull_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
-    yield from merge_steps(points, seuil=64)
+def merge_hull_trace(points: Sequence[Sequence[float]]) -> Trace:
+    return merge_trace(points, seuil=64)
 
 
-def preparata_hong_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
-    yield from merge_steps(points, seuil=32)
+def preparata_hong_trace(points: Sequence[Sequence[float]]) -> Trace:
+    return merge_trace(points, seuil=32)
+
+
+# Etapes completes {"hull", "active", "label", "close"}, rejouees depuis les traces.
+def monotone_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+    return iter(Rejoueur(monotone_trace(points)))
 
 
-def animate_algorithms(points: Sequence[Sequence[float]], pause: float = 0.7) -> None:
+def graham_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+    return iter(Rejoueur(graham_trace(points)))
+
+
+def quickhull_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+    return iter(Rejoueur(quickhull_trace(points)))
+
+
+def merge_steps(points: Sequence[Sequence[float]], seuil: int) -> Iterator[Step]:
+    return iter(Rejoueur(merge_trace(points, seuil)))
+
+
+def merge_hull_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+    return iter(Rejoueur(merge_hull_trace(points)))
+
+
+def preparata_hong_steps(points: Sequence[Sequence[float]]) -> Iterator[Step]:
+    return iter(Rejoueur(preparata_hong_trace(points)))
+
+
+ALGORITHMES = [
+    ("Monotone Chain", monotone_trace),
+    ("Graham Scan", graham_trace),
+    ("QuickHull", quickhull_trace),
+    ("Merge Hull", merge_hull_trace),
+    ("Preparata-Hong", preparata_hong_trace),
+]
+
+# gif (Pillow), mp4 (ffmpeg) ou png (planche de vignettes).
+FORMATS = ("gif", "mp4", "png")
+HULL_COLOR = "tab:blue"
+ACTIVE_COLOR = "tab:red"
+
+
+def animate_algorithms(
+    points: Sequence[Sequence[float]],
+    pause: float = 0.1,
+    format: str = "gif",
+    workers: Optional[int] = None,
+    dpi: int = 100,
+    max_images: Optional[int] = None,
+) -> List[Path]:
+    """
+    Anime chaque algorithme dans un seul fichier STEPS_DIR/<algo>.<format>.
+
+    Le nuage et les axes sont dessines une fois; chaque etape ne redessine (blit)
+    que la ligne d'enveloppe, le point actif et la legende. Les algorithmes sont
+    rendus en parallele, un processus chacun (workers <= 1: en serie), et les
+    images sont envoyees au fil de l'eau a l'encodeur. pause est la duree d'une
+    image en secondes; max_images sous-echantillonne les etapes des grands nuages.
+    Renvoie les chemins ecrits.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format inconnu: {format!r} (choix: {', '.join(FORMATS)})")
     pts = _unique(points)
     if not pts:
         print("Aucun point a afficher.")
-        return
+        return []
+    STEPS_DIR.mkdir(parents=True, exist_ok=True)
+    taches = [
+        (name, recorder, pts, STEPS_DIR / f"{name.lower().replace(' ', '_')}.{format}", format, pause, dpi, max_images)
+        for name, recorder in ALGORITHMES
+    ]
+    if workers is not None and workers <= 1:
+        return [_render(*tache) for tache in taches]
+    with ProcessPoolExecutor(max_workers=min(len(taches), workers or os.cpu_count() or 1)) as pool:
+        return list(pool.map(_render, *zip(*taches)))
+
+
+def _render(name: str, recorder, pts: List[Point], path: Path, format: str,
+            pause: float, dpi: int, max_images: Optional[int]) -> Path:
+    """Rend la trace d'un algorithme dans path (execute dans un processus du pool)."""
+    replay = Rejoueur(recorder(pts))
+    # Seules les images retenues sont reconstruites, en un passage sur la trace.
+    frames = _frames(name, replay.images(_sous_echantillon(len(replay), max_images)), pts, dpi)
+    if format == "gif":
+        _write_gif(frames, path, pause)
+    elif format == "mp4":
+        _write_mp4(frames, path, pause)
+    else:
+        _write_sheet(frames, path)
+    return path
+
+
+def _sous_echantillon(total: int, max_images: Optional[int]) -> Sequence[int]:
+    """Indices de max_images images regulierement espacees, premiere et derniere comprises."""
+    if max_images is None or total <= max_images:
+        return range(total)
+    if max_images <= 1:
+        return [total - 1]
+    return [round(k * (total - 1) / (max_images - 1)) for k in range(max_images)]
+
+
+def _frames(name: str, steps: Iterable[Step], pts: List[Point], dpi: int) -> Iterator[np.ndarray]:
+    """Images RGB (hauteur, largeur, 3) des etapes, rendues par blit sur un fond fixe."""
+    # Canevas Agg sans pyplot: aucun etat global partage entre les processus.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
     xs = [p[0] for p in pts]
     ys = [p[1] for p in pts]
-    span_x = max(xs) - min(xs)
-    span_y = max(ys) - min(ys)
-    span = max(span_x, span_y)
+    span = max(max(xs) - min(xs), max(ys) - min(ys))
     padding = 0.08 * span if span else 1.0
 
-    step_funcs = [
-        ("Monotone Chain", monotone_steps),
-        ("Graham Scan", graham_steps),
-        ("QuickHull", quickhull_steps),
-        ("Merge Hull", merge_hull_steps),
-        ("Preparata-Hong", preparata_hong_steps),
+    fig = Figure(figsize=(6.5, 6.5), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.scatter(xs, ys, s=18 if len(pts) <= 1000 else 3, color="gray", alpha=0.45)
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_title(name)
+    ax.set_xlim(min(xs) - padding, max(xs) + padding)
+    ax.set_ylim(min(ys) - padding, max(ys) + padding)
+    ax.grid(True, linestyle="--", alpha=0.35)
+    # Artistes animes: exclus du fond, redessines seuls a chaque etape.
+    (hull_line,) = ax.plot([], [], color=HULL_COLOR, linewidth=2, animated=True)
+    highlight = ax.scatter([], [], s=60, color=ACTIVE_COLOR, zorder=5, animated=True)
+    label = ax.text(0.02, 0.98, "", transform=ax.transAxes, va="top", fontsize=8, animated=True)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    for step in steps:
+        canvas.restore_region(background)
+        hx, hy = _close_coords(step.get("hull", []), step.get("close", False))
+        hull_line.set_data(hx, hy)
+        active = step.get("active")
+        highlight.set_offsets([active] if active is not None else [[math.nan, math.nan]])
+        label.set_text(step.get("label", ""))
+        for artist in (hull_line, highlight, label):
+            ax.draw_artist(artist)
+        # Copie: le tampon du canevas est reutilise par l'etape suivante.
+        yield np.asarray(canvas.buffer_rgba())[..., :3].copy()
+
+
+def _write_gif(frames: Iterator[np.ndarray], path: Path, pause: float) -> None:
+    """
+    Toutes les images partagent une palette fixe: la conversion est alors une
+    simple recherche de couleur et l'encodeur n'a pas a retoucher les palettes.
+    """
+    from PIL import Image
+
+    first = next(frames)
+    palette = _palette(first)
+
+    def indexed(frame: np.ndarray) -> "Image.Image":
+        return Image.fromarray(frame).quantize(palette=palette, dither=Image.Dither.NONE)
+
+    indexed(first).save(path, save_all=True, append_images=map(indexed, frames),
+                        duration=round(pause * 1000), loop=0, optimize=False)
+
+
+def _palette(first: np.ndarray) -> "Image.Image":
+    """Palette de 256 couleurs: premiere image et degrades vers le blanc des couleurs animees."""
+    from matplotlib.colors import to_rgb
+    from PIL import Image
+
+    t = np.linspace(0.0, 1.0, first.shape[1])[:, None]
+    ramps = [np.rint(255 * ((1 - t) * np.array(to_rgb(c)) + t)).astype(np.uint8)
+             for c in (HULL_COLOR, ACTIVE_COLOR, "black")]
+    sample = np.concatenate([first] + [np.repeat(r[None], 4, axis=0) for r in ramps])
+    return Image.fromarray(sample).quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+
+
+def _write_mp4(frames: Iterator[np.ndarray], path: Path, pause: float) -> None:
+    """Images brutes envoyees sur l'entree standard de ffmpeg, sans fichier intermediaire."""
+    from matplotlib import rcParams
+
+    ffmpeg = shutil.which(rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg introuvable: format mp4 indisponible")
+    first = next(frames)
+    height, width = first.shape[:2]
+    commande = [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", f"{1 / pause:g}", "-i", "-",
+        # yuv420p exige des dimensions paires.
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", str(path),
     ]
-
-    for name, generator in step_funcs:
-        algo_dir = STEPS_DIR / name.lower().replace(" ", "_")
-        algo_dir.mkdir(parents=True, exist_ok=True)
-
-        fig, ax = plt.subplots(figsize=(6.5, 6.5))
-        ax.scatter(xs, ys, s=18, color="gray", alpha=0.45)
-        (hull_line,) = ax.plot([], [], color="tab:blue", linewidth=2)
-        highlight = ax.scatter([], [], s=60, color="tab:red", zorder=5)
-        ax.set_aspect("equal", adjustable="box")
-        ax.set_title(name)
-        ax.set_xlim(min(xs) - padding, max(xs) + padding)
-        ax.set_ylim(min(ys) - padding, max(ys) + padding)
-        ax.grid(True, linestyle="--", alpha=0.35)
-
-        highlight.set_offsets([[math.nan, math.nan]])
-        frame_idx = 0
-        saved_frame = False
-
-        for step in generator(pts):
-            hx, hy = _close_coords(step.get("hull", []), step.get("close", False))
-            hull_line.set_data(hx, hy)
-            active = step.get("active")
-            if active is not None:
-                highlight.set_offsets([active])
-            else:
-                highlight.set_offsets([[math.nan, math.nan]])
-            fig.canvas.draw()
-            frame_path = algo_dir / f"{frame_idx:03d}.png"
-            fig.savefig(frame_path, dpi=150)
-            frame_idx += 1
-            saved_frame = True
-
-        if not saved_frame:
-            fig.canvas.draw()
-            frame_path = algo_dir / "000.png"
-            fig.savefig(frame_path, dpi=150)
-
-        plt.close(fig)
+    with subprocess.Popen(commande, stdin=subprocess.PIPE) as proc:
+        for frame in itertools.chain([first], frames):
+            proc.stdin.write(frame.tobytes())
+        proc.stdin.close()
+    if proc.returncode:
+        raise RuntimeError(f"ffmpeg a echoue (code {proc.returncode})")
+
+
+def _write_sheet(frames: Iterator[np.ndarray], path: Path, thumb: int = 160) -> None:
+    """Planche PNG: une vignette par etape, en grille presque carree."""
+    from PIL import Image
+
+    thumbs = []
+    for frame in frames:
+        image = Image.fromarray(frame)
+        image.thumbnail((thumb, thumb))
+        thumbs.append(image)
+    columns = math.ceil(math.sqrt(len(thumbs)))
+    rows = math.ceil(len(thumbs) / columns)
+    width, height = thumbs[0].size
+    sheet = Image.new("RGB", (columns * width, rows * height), "white")
+    for k, image in enumerate(thumbs):
+        sheet.paste(image, ((k % columns) * width, (k // columns) * height))
+    sheet.save(path)
 
 
 def main() -> None:
     points = nuage(120)
-    animate_algorithms(points)
+    for path in animate_algorithms(points):
+        print(f"Animation ecrite dans {path}")
 
 
 if __name__ == "__main__":
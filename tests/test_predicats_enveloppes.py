@@ -0,0 +1,149 @@
+"""Predicats exacts contre des Fractions, et les sept algorithmes contre une reference exacte."""
+
+import math
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from algorithms import (
+    IncrementalHull,
+    SlidingWindowHull,
+    enveloppe_chan,
+    enveloppe_graham,
+    enveloppe_kirkpatrick_seidel,
+    enveloppe_monotone,
+    enveloppe_quickhull,
+    merge_hull,
+    preparata_hong,
+)
+from algorithms.predicats import orient, orient_lot
+
+ALGORITHMES = [
+    enveloppe_monotone,
+    enveloppe_quickhull,
+    enveloppe_graham,
+    merge_hull,
+    preparata_hong,
+    enveloppe_chan,
+    enveloppe_kirkpatrick_seidel,
+]
+
+
+def _signe_fraction(a, b, c):
+    ax, ay, bx, by, cx, cy = (Fraction(v) for v in (*a, *b, *c))
+    det = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (det > 0) - (det < 0)
+
+
+def _enveloppe_reference(points):
+    """Monotone Chain en arithmetique exacte: sens anti-horaire, sans sommets alignes."""
+    pts = sorted({(p[0], p[1]) for p in points})
+    if len(pts) <= 1:
+        return pts
+    basse, haute = [], []
+    for p in pts:
+        while len(basse) >= 2 and _signe_fraction(basse[-2], basse[-1], p) <= 0:
+            basse.pop()
+        basse.append(p)
+    for p in reversed(pts):
+        while len(haute) >= 2 and _signe_fraction(haute[-2], haute[-1], p) <= 0:
+            haute.pop()
+        haute.append(p)
+    return basse[:-1] + haute[:-1]
+
+
+def _quasi_alignes(rng, n):
+    # Points d'une droite de pente non dyadique, decales de quelques ulp: le
+    # determinant flottant est du meme ordre que son erreur d'arrondi.
+    t = [rng.uniform(0, 1) for _ in range(n)]
+    return [(x, math.nextafter(0.1 * x + 0.3, rng.choice((-1.0, 2.0)))) for x in t]
+
+
+def _nuage(distribution, n, graine):
+    rng = random.Random(graine)
+    if distribution == "uniforme":
+        return [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(n)]
+    if distribution == "cercle":
+        return [(math.cos(a), math.sin(a)) for a in (rng.uniform(0, 2 * math.pi) for _ in range(n))]
+    if distribution == "grille":
+        return [(rng.randint(0, 8), rng.randint(0, 8)) for _ in range(n)]
+    if distribution == "colineaire":
+        # Pas dyadique: les points sont exactement alignes, plus un point voisin.
+        return [(k / 64, k / 64) for k in (rng.randint(-500, 500) for _ in range(n))] + [(0.5, 0.49)]
+    return _quasi_alignes(rng, n)
+
+
+def test_orient_signe_exact():
+    rng = random.Random(0)
+    triplets = []
+    for _ in range(2000):
+        a, b, c = _quasi_alignes(rng, 3)
+        triplets.append((a, b, c))
+    for _ in range(500):
+        a, b, c = ((rng.randint(-2 ** 40, 2 ** 40), rng.randint(-2 ** 40, 2 ** 40)) for _ in range(3))
+        triplets.append((a, b, c))
+    for a, b, c in triplets:
+        o = orient(a, b, c)
+        assert (o > 0) - (o < 0) == _signe_fraction(a, b, c)
+
+
+def test_orient_lot_signe_exact():
+    rng = random.Random(1)
+    a, b = (0.0, 0.3), (1.0, 0.4)
+    c = np.array(_quasi_alignes(rng, 3000) + [a, b])
+    attendu = [_signe_fraction(a, b, p) for p in c.tolist()]
+    assert orient_lot(np.array(a), np.array(b), c).tolist() == attendu
+    # Lots d'entiers: int64 sous 2**30, int Python au-dela.
+    for borne in (2 ** 20, 2 ** 40):
+        e = np.array([[rng.randint(-borne, borne) for _ in range(2)] for _ in range(500)])
+        lignes = e.tolist()
+        attendu = [_signe_fraction(lignes[0], lignes[1], p) for p in lignes]
+        assert orient_lot(e[0], e[1], e).tolist() == attendu
+
+
+@pytest.mark.parametrize("distribution", ["uniforme", "cercle", "grille", "colineaire", "quasi_colineaire"])
+@pytest.mark.parametrize("algorithme", ALGORITHMES, ids=lambda f: f.__name__)
+def test_enveloppe_exacte(algorithme, distribution):
+    for graine, n in enumerate((3, 10, 200, 2000)):
+        points = _nuage(distribution, n, graine)
+        attendu = _enveloppe_reference(points)
+        assert [tuple(p) for p in algorithme(points)] == attendu
+
+
+@pytest.mark.parametrize("distribution", ["uniforme", "grille"])
+@pytest.mark.parametrize("algorithme", ALGORITHMES, ids=lambda f: f.__name__)
+def test_enveloppe_tableau(algorithme, distribution):
+    # Un tableau numpy donne la meme enveloppe que la liste de ses points.
+    points = _nuage(distribution, 300, 7)
+    assert [tuple(p) for p in algorithme(np.array(points))] == _enveloppe_reference(points)
+
+
+def test_incremental_quasi_colineaire():
+    # Insertions une a une et fenetre glissante: meme enveloppe que enveloppe_monotone.
+    rng = random.Random(11)
+    for _ in range(200):
+        points = _quasi_alignes(rng, 30)
+        assert IncrementalHull(points).vertices == [tuple(p) for p in enveloppe_monotone(points)]
+        fenetre = SlidingWindowHull(max_count=20)
+        for k, p in enumerate(points):
+            fenetre.add(p, instant=k)
+        assert fenetre.vertices == [tuple(p) for p in enveloppe_monotone(points[-20:])]
+
+
+@pytest.mark.parametrize("seuil", [3, 64])
+def test_kirkpatrick_seidel_seuil(seuil):
+    # Recursion complete (seuil minimal) et balayage monotone des petites chaines.
+    for distribution in ("cercle", "grille", "quasi_colineaire"):
+        points = _nuage(distribution, 2000, 5)
+        assert enveloppe_kirkpatrick_seidel(points, seuil=seuil) == _enveloppe_reference(points)
+
+
+@pytest.mark.parametrize("algorithme", ALGORITHMES, ids=lambda f: f.__name__)
+def test_petites_entrees(algorithme):
+    # Moins de trois points distincts: doublons retires, ordre lexicographique.
+    for points in ([], [(1.0, 2.0), (1.0, 2.0)], [(3.0, 1.0), (1.0, 2.0)], [(3.0, 1.0), (1.0, 2.0), (3.0, 1.0)]):
+        attendu = _enveloppe_reference(points)
+        assert [tuple(p) for p in algorithme(points)] == attendu
+        assert [tuple(p) for p in algorithme(np.array(points).reshape(-1, 2))] == attendu
@@ -0,0 +1,178 @@
+"""Traces compactes des etapes d'un algorithme: journal d'evenements et rejeu."""
+
+import struct
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Codes d'evenement appliques a la chaine affichee (liste d'indices de points).
+PUSH, POP, INSERE, VIDE, NOTE = range(5)
+
+# 15 octets par evenement, sans alignement. point: point ajoute, retire ou mis en
+# evidence (-1 aucun); position: rang d'insertion (INSERE); image: une image se
+# termine sur cet evenement; ferme: la chaine de cette image est fermee.
+EVENEMENT = np.dtype([
+    ("code", "u1"), ("image", "?"), ("ferme", "?"),
+    ("libelle", "<i4"), ("point", "<i4"), ("position", "<i4"),
+])
+_FORMAT = struct.Struct("<B??iii")
+
+# Nombre d'images entre deux reprises memorisees par le rejoueur.
+_INTERVALLE = 256
+# Evenements decodes par bloc lors d'un rejeu.
+_BLOC = 4096
+
+
+class Trace:
+    """
+    Journal d'un algorithme: points (tableau (n, 2)), evenements (tableau structure
+    EVENEMENT) et table des libelles. Un libelle peut contenir {p}, remplace au
+    rejeu par le point de l'evenement.
+    """
+
+    def __init__(self, points: np.ndarray, evenements: np.ndarray, libelles: List[str]):
+        self.points = points
+        self.evenements = evenements
+        self.libelles = libelles
+
+    def __len__(self) -> int:
+        """Nombre d'images de la trace."""
+        return int(np.count_nonzero(self.evenements["image"]))
+
+    def __repr__(self) -> str:
+        return f"Trace({len(self.evenements)} evenements, {len(self)} images, {self.nbytes} octets)"
+
+    @property
+    def nbytes(self) -> int:
+        """Taille du journal (points et evenements, hors libelles)."""
+        return self.points.nbytes + self.evenements.nbytes
+
+
+class Enregistreur:
+    """
+    Construit une Trace evenement par evenement. Chaque methode produit une image,
+    sauf image=False (etats intermediaires d'un remplacement par exemple).
+    """
+
+    def __init__(self, points: Sequence[Sequence[float]]):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._tampon = bytearray()
+        self._libelles: List[str] = []
+        self._rangs = {}
+
+    def push(self, k: int, libelle: Optional[str] = None, ferme: bool = False, image: bool = True) -> None:
+        """Ajoute le point k en fin de chaine."""
+        self._ajoute(PUSH, k, 0, libelle, ferme, image)
+
+    def pop(self, k: int, libelle: Optional[str] = None, ferme: bool = False, image: bool = True) -> None:
+        """Retire le dernier point de la chaine, k (note pour la mise en evidence)."""
+        self._ajoute(POP, k, 0, libelle, ferme, image)
+
+    def insere(self, position: int, k: int, libelle: Optional[str] = None, ferme: bool = False) -> None:
+        """Insere le point k au rang position de la chaine."""
+        self._ajoute(INSERE, k, position, libelle, ferme, True)
+
+    def note(self, libelle: str, k: int = -1, ferme: bool = False) -> None:
+        """Image sans changement de la chaine (k: point mis en evidence, -1 aucun)."""
+        self._ajoute(NOTE, k, 0, libelle, ferme, True)
+
+    def remplace(self, indices: Sequence[int], libelle: Optional[str] = None, ferme: bool = False) -> None:
+        """Remplace toute la chaine (fusion, cas de base): une seule image."""
+        self._ajoute(VIDE, -1, 0, libelle, ferme, False)
+        for k in indices:
+            self._ajoute(PUSH, k, 0, libelle, ferme, False)
+        self._ajoute(NOTE, -1, 0, libelle, ferme, True)
+
+    def trace(self) -> Trace:
+        evenements = np.frombuffer(bytes(self._tampon), dtype=EVENEMENT)
+        return Trace(self.points, evenements, list(self._libelles))
+
+    def _ajoute(self, code, k, position, libelle, ferme, image):
+        rang = -1
+        if libelle is not None:
+            rang = self._rangs.get(libelle)
+            if rang is None:
+                rang = self._rangs[libelle] = len(self._libelles)
+                self._libelles.append(libelle)
+        self._tampon += _FORMAT.pack(code, image, ferme, rang, k, position)
+
+
+class Rejoueur:
+    """
+    Reconstruit les images d'une Trace sous forme d'etapes {"hull", "active",
+    "label", "close"}. rejoueur[k] saute a l'image k depuis la reprise la plus
+    proche (etats memorises toutes les intervalle images, au premier acces
+    direct); iterer ou appeler images() rejoue en un seul passage.
+    """
+
+    def __init__(self, trace: Trace, intervalle: int = _INTERVALLE):
+        self.trace = trace
+        self.intervalle = max(1, intervalle)
+        self._fins = np.flatnonzero(trace.evenements["image"])  # Evenement final de chaque image.
+        self._coords = trace.points.tolist()
+        self._reprises: Optional[List[List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self._fins)
+
+    def __getitem__(self, k: int) -> dict:
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("image hors de la trace")
+        if self._reprises is None:
+            self._reprises = self._memorise()
+        r = k // self.intervalle
+        chaine = list(self._reprises[r])
+        fin = int(self._fins[k]) + 1
+        self._applique(chaine, int(self._fins[r * self.intervalle]) + 1, fin)
+        return self._etape(chaine, fin - 1)
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.images(range(len(self)))
+
+    def images(self, indices: Iterable[int]) -> Iterator[dict]:
+        """Etapes des images demandees (indices croissants), en un seul passage."""
+        chaine: List[int] = []
+        suivant = 0  # Premier evenement non encore applique.
+        for k in indices:
+            fin = int(self._fins[k]) + 1
+            self._applique(chaine, suivant, fin)
+            suivant = fin
+            yield self._etape(chaine, fin - 1)
+
+    def _memorise(self) -> List[List[int]]:
+        """Chaine apres chaque image multiple de intervalle, en un passage."""
+        reprises = []
+        chaine: List[int] = []
+        suivant = 0
+        for k in range(0, len(self), self.intervalle):
+            fin = int(self._fins[k]) + 1
+            self._applique(chaine, suivant, fin)
+            suivant = fin
+            reprises.append(list(chaine))
+        return reprises
+
+    def _applique(self, chaine: List[int], debut: int, fin: int) -> None:
+        """Applique a chaine les evenements [debut, fin), decodes par blocs."""
+        for bloc in range(debut, fin, _BLOC):
+            for code, _, _, _, k, position in self.trace.evenements[bloc:min(bloc + _BLOC, fin)].tolist():
+                if code == PUSH:
+                    chaine.append(k)
+                elif code == POP:
+                    chaine.pop()
+                elif code == INSERE:
+                    chaine.insert(position, k)
+                elif code == VIDE:
+                    chaine.clear()
+
+    def _etape(self, chaine: List[int], e: int) -> dict:
+        _, _, ferme, libelle, k, _ = self.trace.evenements[e].tolist()
+        actif = tuple(self._coords[k]) if k >= 0 else None
+        texte = self.trace.libelles[libelle] if libelle >= 0 else ""
+        return {
+            "hull": [tuple(self._coords[i]) for i in chaine],
+            "active": actif,
+            "label": texte.replace("{p}", str(actif)),
+            "close": ferme,
+        }
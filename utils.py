@@ -2,8 +2,8 @@
 
 import math as m
 import random as rd
-import time as t
-import statistics as stats
+
+import numpy as np
 
 
 def cross(o, a, b):
@@ -21,17 +21,34 @@ def area_signed(poly):
     return 0.5 * s
 
 
+def aires_signees(points, decalages):
+    """
+    Version par lots de area_signed: aire signee de chaque polygone d'un stockage
+    CSR (polygone g = points[decalages[g]:decalages[g + 1]], voir
+    enveloppes_monotone_groupees). Renvoie un tableau float64 de G aires.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    decalages = np.asarray(decalages, dtype=np.intp).reshape(-1)
+    tailles = np.diff(decalages)
+    groupe = np.repeat(np.arange(len(tailles)), tailles)
+    # Successeur de chaque sommet, le dernier d'un polygone revenant au premier.
+    suivant = np.arange(1, len(pts) + 1)
+    fins = decalages[1:][tailles > 0] - 1
+    suivant[fins] = decalages[:-1][tailles > 0]
+    x, y = pts[:, 0], pts[:, 1]
+    termes = x * y[suivant] - x[suivant] * y
+    return 0.5 * np.bincount(groupe, weights=termes, minlength=len(tailles))
+
+
 def nuage(n, xmin=-10, xmax=10, ymin=-10, ymax=10):
     """Genere n points uniformes dans un rectangle axis-aligne."""
     return [[rd.uniform(xmin, xmax), rd.uniform(ymin, ymax)] for _ in range(n)]
 
 
 def benchmark(func, points, repeat=5):
-    """Evalue un algorithme: moyenne du temps sur repeat executions."""
-    times = []
-    for _ in range(repeat):
-        start = t.time()
-        enveloppe = func(points)
-        times.append((t.time() - start) * 1000)
-    elapsed = stats.mean(times)
-    return elapsed, len(enveloppe)
+    """Evalue un algorithme: temps median (ms) sur repeat executions, voir bench.mesurer."""
+    # Import differe: utils est importe par toutes les enveloppes, bench n'est utile qu'ici.
+    from bench import mesurer
+
+    mesure = mesurer(func, points, repeat=repeat)
+    return mesure["mediane_ms"], mesure["sommets"]